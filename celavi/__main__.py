@@ -8,6 +8,7 @@ Authors: Rebecca Hanes, Alicia Key, Tapajyoti (TJ) Ghosh, Annika Eberle
 """
 
 import argparse
+import cProfile
 
 from celavi.scenario import Scenario
 
@@ -21,5 +22,20 @@ PARSER.add_argument(
     "--scenario", help="Name of scenario-specific config file in the data folder."
 )
 
+PARSER.add_argument(
+    "--profile",
+    help="Optional path of a file to save cProfile statistics of the model run to.",
+)
+
 if __name__ == "__main__":
-    Scenario(parser=PARSER)
+    profile_filename = PARSER.parse_args().profile
+    if profile_filename:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            Scenario(parser=PARSER)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(profile_filename)
+    else:
+        Scenario(parser=PARSER)
@@ -1,5 +1,4 @@
-from typing import Deque, Tuple, Dict
-from collections import deque
+from typing import Tuple, Dict
 
 from celavi.uncertainty_methods import apply_array_uncertainty
 
@@ -7,12 +6,30 @@ from celavi.uncertainty_methods import apply_array_uncertainty
 class Component:
     """
     The Component class works with the Context class to run the discrete
-    event simulation. There is one instance of Component per physical
-    component in the simulation. This class models each step in the
+    event simulation. Each instance of Component represents a cohort of one
+    or more identical physical components that share a lifecycle. This
+    class models each step in the
     lifecycle of the component, from begining of life (BOL) to end of
     life (EOL).
     """
 
+    # There can be millions of components in a simulation, so instances do
+    # not carry a per-instance __dict__.
+    __slots__ = (
+        "context",
+        "kind",
+        "year",
+        "mass_tonnes",
+        "manuf_facility_id",
+        "in_use_facility_id",
+        "current_location",
+        "initial_lifespan_timesteps",
+        "pathway",
+        "_pathway_idx",
+        "split_dict",
+        "n_components",
+    )
+
     def __init__(
         self,
         context,
@@ -22,6 +39,7 @@ class Component:
         manuf_facility_id: int,
         in_use_facility_id: int,
         mass_tonnes: Dict[str, float] = 0,
+        n_components: int = 1,
     ):
         """
         This takes parameters named the same as the instance variables. See
@@ -67,6 +85,11 @@ class Component:
             The facility ID where the component spends its first useful lifetime
             before beginning the end-of-life process (typically but not necessarily
             a renewable energy power plant).
+
+        n_components: int
+            Number of identical physical components represented by this
+            instance. Inventories and transportation are incremented by this
+            number. Defaults to 1.
         """
 
         self.context = context
@@ -77,8 +100,10 @@ class Component:
         self.in_use_facility_id = in_use_facility_id
         self.current_location = "manufacturing_" + str(self.manuf_facility_id)
         self.initial_lifespan_timesteps = int(lifespan_timesteps)  # timesteps
-        self.pathway: Deque[Tuple[str, int]] = deque()
+        self.pathway: Tuple[Tuple[str, int, float, str], ...] = ()
+        self._pathway_idx: int = 0
         self.split_dict = self.context.path_dict["path_split"]
+        self.n_components = n_components
 
     def create_pathway_queue(self, from_facility_id: int):
         """
@@ -87,7 +112,8 @@ class Component:
         and during the eol_process when exiting the in use stage.
 
         This method does not return anything, rather it modifies the
-        instance attribute self.pathway with a new deque.
+        instance attribute self.pathway with a new tuple of pathway steps and
+        resets the index of the next step to visit.
 
         Parameters
         ----------
@@ -95,32 +121,35 @@ class Component:
             The starting location of the the component.
         """
         in_use_facility_id = f"in use_{int(from_facility_id)}"
-        path_choices = self.context.cost_graph.choose_paths(source=in_use_facility_id)
+        path_choices = self.context.get_cached_paths(source=in_use_facility_id)
         path_choices_dict = {
             path_choice["source"]: path_choice for path_choice in path_choices
         }
 
         path_choice = path_choices_dict[in_use_facility_id]
-        self.pathway = deque()
+        # Facility name prefixes that keep a component for the rest of the
+        # simulation, as a tuple for a single str.startswith() test
+        permanent_facilities = tuple(
+            self.context.path_dict["permanent_lifespan_facility"]
+        )
+        pathway = []
         for facility, lifespan, distance, route_id in path_choice["path"]:
             # Override the initial timespan when component goes into use.
 
             if facility.startswith("in use"):
-                self.pathway.append(
+                pathway.append(
                     (facility, self.initial_lifespan_timesteps, distance, route_id)
                 )
-            elif any(
-                [
-                    facility.startswith(i)
-                    for i in self.context.path_dict["permanent_lifespan_facility"]
-                ]
-            ):
-                self.pathway.append(
+            elif facility.startswith(permanent_facilities):
+                pathway.append(
                     (facility, self.context.max_timesteps * 2, distance, route_id)
                 )
             # Otherwise, use the timespan the model gives us.
             else:
-                self.pathway.append((facility, lifespan, distance, route_id))
+                pathway.append((facility, lifespan, distance, route_id))
+
+        self.pathway = tuple(pathway)
+        self._pathway_idx = 0
 
     def bol_process(self, env):
         """
@@ -129,25 +158,18 @@ class Component:
         processes. When the component reaches end-of-life, this method
         sets the end-of-life (EOL) pathway for the component.
 
+        The Context starts this process in the timestep when the component
+        is manufactured, so it does not wait for its year to begin.
+
         Parameters
         ----------
         env: simpy.Environment
             The SimPy environment running the DES timesteps.
         """
-        begin_timestep = (
-            self.year - self.context.min_year
-        ) * self.context.timesteps_per_year
         lifespan = 1
 
-        # component waits to be manufactured
-        yield env.timeout(begin_timestep)
-
         # Increment manufacturing inventories
-        count_inventory = self.context.count_facility_inventories[self.current_location]
-        mass_inventory = self.context.mass_facility_inventories[self.current_location]
-        count_inventory.increment_quantity(self.kind, 1, env.now)
-        for material, mass in self.mass_tonnes.items():
-            mass_inventory.increment_quantity(material, mass, env.now)
+        self.update_inventories(self.current_location, 1, env.now)
 
         # Component waits to transition to in use
         yield env.timeout(lifespan)
@@ -155,25 +177,20 @@ class Component:
         # Decrement manufacturing inventories
         # No transportation here: transportation is tracked at destination
         # facilities
-        count_inventory.increment_quantity(self.kind, -1, env.now)
-        for material, mass in self.mass_tonnes.items():
-            mass_inventory.increment_quantity(material, -mass, env.now)
+        self.update_inventories(self.current_location, -1, env.now)
 
         # Component is now in use; update the location
         self.current_location = f"in use_{int(self.in_use_facility_id)}"
 
         # Increment in use inventories
-        count_inventory = self.context.count_facility_inventories[self.current_location]
-        mass_inventory = self.context.mass_facility_inventories[self.current_location]
-        count_inventory.increment_quantity(self.kind, 1, env.now)
-        for material, mass in self.mass_tonnes.items():
-            mass_inventory.increment_quantity(material, mass, env.now)
+        self.update_inventories(self.current_location, 1, env.now)
 
         # Increment transportation to in use facilities
         count_transport = self.context.transportation_trackers[self.current_location]
         for _, mass in self.mass_tonnes.items():
             count_transport.increment_inbound_tonne_km(
-                tonne_km=mass
+                tonne_km=self.n_components
+                * mass
                 * self.context.cost_graph.supply_chain.edges[
                     f"manufacturing_{int(self.manuf_facility_id)}",
                     f"in use_{int(self.in_use_facility_id)}",
@@ -192,11 +209,9 @@ class Component:
         self.create_pathway_queue(self.in_use_facility_id)
 
         # Component is decremented from in use inventories
-        count_inventory.increment_quantity(self.kind, -1, env.now)
-        for material, mass in self.mass_tonnes.items():
-            mass_inventory.increment_quantity(material, -mass, env.now)
+        self.update_inventories(self.current_location, -1, env.now)
         # Take the current facility off the to-do list
-        self.pathway.popleft()
+        self._pathway_idx += 1
 
         # Begin the end of life process
         env.process(self.eol_process(env))
@@ -212,8 +227,11 @@ class Component:
             The environment in which this process is running.
         """
         while True:
-            if self.pathway:
-                location, lifespan, distance, route_id = self.pathway.popleft()
+            if self._pathway_idx < len(self.pathway):
+                location, lifespan, distance, route_id = self.pathway[
+                    self._pathway_idx
+                ]
+                self._pathway_idx += 1
                 factype = location.split("_")[0]
                 if factype in self.split_dict.keys():
                     # increment the facility inventory and transportation tracker
@@ -296,18 +314,17 @@ class Component:
             UUID for route along which component is moved. Defaults to None.
 
         amt : float
-            Number of components being moved. Defaults to 1.        
+            Number of components being moved, per component in this cohort.
+            Defaults to 1.
         """
-        self.context.count_facility_inventories[loc].increment_quantity(
-            self.kind, amt, env.now
-        )
+        self.update_inventories(loc, amt, env.now)
 
-        for _mat, _mass in self.mass_tonnes.items():
-            self.context.mass_facility_inventories[loc].increment_quantity(
-                _mat, amt * _mass, env.now
-            )
-            self.context.transportation_trackers[loc].increment_inbound_tonne_km(
-                tonne_km=amt * _mass * dist, timestep=env.now, route_id=route_id
+        transportation_tracker = self.context.transportation_trackers[loc]
+        for _mass in self.mass_tonnes.values():
+            transportation_tracker.increment_inbound_tonne_km(
+                tonne_km=self.n_components * amt * _mass * dist,
+                timestep=env.now,
+                route_id=route_id,
             )
 
     def move_component_from(self, env, loc, amt=1.0):
@@ -326,15 +343,33 @@ class Component:
             Current facility ID.
         
         amt : float
-            Number of components being moved. Defaults to 1.
+            Number of components being moved, per component in this cohort.
+            Defaults to 1.
+        """
+        self.update_inventories(loc, -amt, env.now)
+
+    def update_inventories(self, loc: str, amt: float, timestep: int):
         """
+        Change the count and mass inventories at a facility by a number of
+        components in a single call.
+
+        Parameters
+        ----------
+        loc: str
+            Facility node name, in the format "step_facilityid".
 
+        amt: float
+            Number of components added to (positive) or removed from
+            (negative) the facility, per component in this cohort.
+
+        timestep: int
+            The timestep of the transaction.
+        """
+        amt = amt * self.n_components
         self.context.count_facility_inventories[loc].increment_quantity(
-            self.kind, -amt, env.now
+            self.kind, amt, timestep
+        )
+        self.context.mass_facility_inventories[loc].increment_quantities(
+            self.mass_tonnes, timestep, scale=amt
         )
-
-        for _mat, _mass in self.mass_tonnes.items():
-            self.context.mass_facility_inventories[loc].increment_quantity(
-                _mat, -amt * _mass, env.now
-            )
 
@@ -128,7 +128,7 @@ class ComputeLocations:
         """
 
         # Process data for wind power plants - from USWTDB
-        turbine_locations = Data.TechUnitLocations(fpath=self.power_plant_locations, backfill=self.backfill)
+        turbine_locations = Data.TechUnitLocations(fpath=self.power_plant_locations, backfill=self.backfill).df
         
         # select only those turbines with eia_ids (exclude turbines without) only 9314 out of 67814 don't have eia_id
         turbine_locations_with_eia = turbine_locations[(turbine_locations['eia_id'] != '-1') &
@@ -234,7 +234,7 @@ class ComputeLocations:
         """
 
         # load landfill facility data
-        landfill_locations_all = Data.LandfillLocations(fpath=self.landfill_locations, backfill=self.backfill)
+        landfill_locations_all = Data.LandfillLocations(fpath=self.landfill_locations, backfill=self.backfill).df
 
         # reformat landfill data
         landfill_locations_all = landfill_locations_all.rename(columns={"State": "region_id_2",
@@ -295,7 +295,7 @@ class ComputeLocations:
                 - region_id_4 : str
         """
 
-        facility_locations = Data.OtherFacilityLocations(fpath=self.other_facility_locations, backfill=self.backfill)
+        facility_locations = Data.OtherFacilityLocations(fpath=self.other_facility_locations, backfill=self.backfill).df
 
         number_other_facilities = len(facility_locations)
         number_unique_facility_id = len(facility_locations.facility_id.unique())
@@ -338,7 +338,7 @@ class ComputeLocations:
         stscen = Data.StandardScenarios(
             fpath=self.standard_scenarios_filename,
             backfill=self.backfill
-        ).rename(
+        ).df.rename(
             columns={'t': 'year'}
         )
 
@@ -3,8 +3,8 @@ import networkx as nx
 import pandas as pd
 import numpy as np
 from itertools import product
-from time import time
-from networkx_query import search_nodes
+from collections import defaultdict
+from time import time, perf_counter
 
 from celavi.costmethods import CostMethods
 
@@ -105,12 +105,16 @@ class CostGraph:
         self.fac_edges = pd.read_csv(fac_edges_file)
         self.transpo_edges = pd.read_csv(transpo_edges_file)
 
-        # these data sets are processed line by line
+        # split the step costs by facility and the intra-facility edges by
+        # facility type once, rather than filtering for every facility
+        self.split_step_costs_and_edges()
+
+        # the routes data set is read when the graph is built
         self.loc_file = locations_file
         self.routes_file = routes_file
 
-        # also read in the locations as a dataframe for reference in
-        # find_nearest
+        # read in the locations as a dataframe for building facility graphs
+        # and for reference in find_nearest
         self.loc_df = pd.read_csv(locations_file)
 
         self.sc_end = sc_end + sc_out_circ
@@ -145,6 +149,89 @@ class CostGraph:
         if save_copy:
             nx.write_edgelist(self.supply_chain, save_name, delimiter=",")
 
+    def __setstate__(self, state: dict):
+        """
+        Restore a pickled CostGraph.
+
+        CostGraph pickles saved before the lookup indices were added do not
+        contain them, so any missing indices are rebuilt from the step costs,
+        the intra-facility edges and the supply chain nodes.
+
+        Parameters
+        ----------
+        state : dict
+            Instance attributes of the pickled CostGraph.
+        """
+        self.__dict__.update(state)
+        if not {"_step_costs_by_facility", "_fac_edges_by_type"} <= state.keys():
+            self.split_step_costs_and_edges()
+        if not {"_step_index", "_facility_index"} <= state.keys():
+            self.index_nodes()
+
+    def split_step_costs_and_edges(self):
+        """
+        Split the step costs by facility ID and the intra-facility edges by
+        facility type, for lookup when the facility graphs are built.
+        """
+        self._step_costs_by_facility = {
+            _id: _df.to_dict(orient="records")
+            for _id, _df in self.step_costs[
+                ["step", "step_cost_method", "facility_id", "connects"]
+            ].groupby("facility_id", sort=False)
+        }
+        self._fac_edges_by_type = {
+            _type: _df
+            for _type, _df in self.fac_edges.groupby("facility_type", sort=False)
+        }
+
+    def index_nodes(self):
+        """
+        Index the supply chain node names by processing step and by facility
+        ID, in the order the nodes were added to the supply chain.
+        """
+        self._step_index = defaultdict(list)
+        self._facility_index = defaultdict(list)
+        for _node, _data in self.supply_chain.nodes(data=True):
+            self._step_index[_data["step"]].append(_node)
+            self._facility_index[_data["facility_id"]].append(_node)
+
+    def elapsed_time(self) -> int:
+        """
+        Whole seconds elapsed since this CostGraph was instantiated, for use
+        in progress messages.
+
+        Returns
+        -------
+        int
+            Elapsed time in seconds, truncated to an integer.
+        """
+        return int(time() - self.start_time)
+
+    def report_phase(self, phase: str, phase_start: float):
+        """
+        Print how long one phase of building the supply chain took and the
+        current size of the supply chain graph. Nothing is printed unless
+        verbose is at least 1.
+
+        Parameters
+        ----------
+        phase : str
+            Description of the phase that just finished.
+        phase_start : float
+            Value of time.perf_counter() when the phase began.
+        """
+        if self.verbose > 0:
+            print(
+                "%s took %.3f s; supply chain has %d nodes and %d edges"
+                % (
+                    phase,
+                    perf_counter() - phase_start,
+                    self.supply_chain.number_of_nodes(),
+                    self.supply_chain.number_of_edges(),
+                ),
+                flush=True,
+            )
+
     @staticmethod
     def get_node_names(facilityID: List[Union[int, str]], subgraph_steps: list):
         """
@@ -164,7 +251,7 @@ class CostGraph:
         list of strings
             List of unique node IDs created from processing step and facility ID
         """
-        return ["{}_{}".format(i, str(facilityID)) for i in subgraph_steps]
+        return [f"{step}_{facilityID}" for step in subgraph_steps]
 
     def all_element_combos(self, list1: list, list2: list):
         """
@@ -225,20 +312,18 @@ class CostGraph:
             if any(len(lst) != _len for lst in [list1, list2, list3]):
                 raise NotImplementedError
             else:
-                return list(map(lambda x, y, z: (x, y, z), list1, list2, list3))
+                return list(zip(list1, list2, list3))
         elif list3 is not None and list4 is not None:
             _len = len(list1)
             if any(len(lst) != _len for lst in [list1, list2, list3, list4]):
                 raise NotImplementedError
             else:
-                return list(
-                    map(lambda w, x, y, z: (w, x, y, z), list1, list2, list3, list4)
-                )
+                return list(zip(list1, list2, list3, list4))
         else:
             if len(list1) != len(list2):
                 raise NotImplementedError
             else:
-                return list(map(lambda x, y: (x, y), list1, list2))
+                return list(zip(list1, list2))
 
     def find_nearest(self, source: str, crit: str):
         """
@@ -270,36 +355,31 @@ class CostGraph:
             self.supply_chain, source, weight=crit
         )
 
-        short_paths = nx.single_source_bellman_ford_path(self.supply_chain, source)
-
         # We are only interested in a particular type(s) of node
-        targets = list(
-            search_nodes(self.supply_chain, {"in": [("step",), self.sc_end]})
-        )
+        targets = {
+            _node for _step in self.sc_end for _node in self._step_index.get(_step, [])
+        }
 
         subdict = {k: v for k, v in lengths.items() if k in targets}
 
         # return the smallest of all lengths to get to typeofnode
         if subdict:
-            # dict of shortest paths to all targets
             nearest = min(subdict, key=subdict.get)
-            timeout = nx.get_node_attributes(self.supply_chain, "timeout")
-            timeout_list = [
-                value for key, value in timeout.items() if key in short_paths[nearest]
-            ]
-            dist_list = [
-                self.supply_chain.edges[short_paths[nearest][d : d + 2]]["dist"]
-                for d in range(len(short_paths[nearest]) - 1)
-            ]
-            dist_list.insert(0, 0.0)
-            route_id_list = [
-                self.supply_chain.edges[short_paths[nearest][d : d + 2]]["route_id"]
-                for d in range(len(short_paths[nearest]) - 1)
-            ]
-            route_id_list.insert(0, None)
-            _out = self.list_of_tuples(
-                short_paths[nearest], timeout_list, dist_list, route_id_list
-            )
+            # Only the path to the nearest target is needed, so it is built
+            # for that target alone rather than for every reachable node
+            _path = nx.bellman_ford_path(self.supply_chain, source, nearest)
+            timeout_list = [self.supply_chain.nodes[n]["timeout"] for n in _path]
+
+            # read each edge along the path once for its distance and route
+            dist_list = [0.0]
+            route_id_list = [None]
+            _adj = self.supply_chain.adj
+            for _u, _v in zip(_path[:-1], _path[1:]):
+                _edge = _adj[_u][_v]
+                dist_list.append(_edge["dist"])
+                route_id_list.append(_edge["route_id"])
+
+            _out = self.list_of_tuples(_path, timeout_list, dist_list, route_id_list)
 
             # create dictionary for this preferred pathway cost and decision
             # criterion and append to the pathway_crit_history
@@ -338,16 +418,17 @@ class CostGraph:
             # not found, no path from source to typeofnode
             return None, None, None
 
-    def get_edges(self, facility_df: pd.DataFrame, u_edge="step", v_edge="next_step"):
+    def get_edges(self, facility: dict, u_edge="step", v_edge="next_step"):
         """
-        Converts two columns of node names into a list of string tuples
-        for intra-facility edge definition with networkx
+        Converts two columns of processing steps into a list of string tuples
+        of unique node names for intra-facility edge definition with networkx
 
         Parameters
         ----------
-        facility_df
-            DataFrame listing processing steps (u_edge) and the next
-            processing step (v_edge) by facility type
+        facility
+            Dictionary of attributes for a single facility, including
+            facility_id and facility_type. Processing steps (u_edge) and the
+            next processing step (v_edge) are looked up by facility type.
         u_edge
             unique processing steps within a facility type
         v_edge
@@ -355,39 +436,40 @@ class CostGraph:
 
         Returns
         -------
-            list of string tuples that define edges within a facility type
+            list of string tuples that define edges within a facility, with
+            node names in the format "step_facilityid"
         """
         if self.verbose > 1:
-            print("Getting edges for ", facility_df["facility_type"].values[0])
+            print("Getting edges for ", facility["facility_type"])
 
-        _type = facility_df["facility_type"].values[0]
+        _type = facility["facility_type"]
+        _id = facility["facility_id"]
 
-        _out = (
-            self.fac_edges[[u_edge, v_edge]]
-            .loc[self.fac_edges.facility_type == _type]
-            .dropna()
-            .to_records(index=False)
-            .tolist()
-        )
+        if _type not in self._fac_edges_by_type:
+            return []
+
+        _steps = self._fac_edges_by_type[_type][[u_edge, v_edge]].dropna()
+
+        # name the edge endpoints uniquely with the facility ID
+        _out = [
+            (f"{_u}_{_id}", f"{_v}_{_id}")
+            for _u, _v in zip(_steps[u_edge], _steps[v_edge])
+        ]
 
         return _out
 
-    def get_nodes(self, facility_df: pd.DataFrame):
+    def get_nodes(self, facility: dict):
         """
         Generates a data structure that defines all nodes and node attributes
-        for a single facility.
+        for a single facility. Processing steps, connection types, and the
+        name of the method (if any) used to calculate processing costs are
+        looked up by facility ID.
 
         Parameters
         ----------
-        facility_df : pd.DataFrame
-            DataFrame containing unique facility IDs, processing steps, and
-            the name of the method (if any) used to calculate processing costs
-
-            Columns:
-                - facility_id : int
-                - step : str
-                - connects : str
-                - step_cost_method : str
+        facility : dict
+            Dictionary of attributes for a single facility, including
+            facility_id, facility_type, and region identifiers.
 
         Returns
         -------
@@ -398,46 +480,38 @@ class CostGraph:
         """
         if self.verbose > 1:
             print(
-                "Getting nodes for facility ", str(facility_df["facility_id"].values[0])
+                "Getting nodes for facility ", str(facility["facility_id"])
             )
 
-        _id = facility_df["facility_id"].values[0]
-
-        # list of nodes (processing steps) within a facility
-        _node_names = (
-            self.step_costs["step"].loc[self.step_costs.facility_id == _id].tolist()
-        )
-
-        # data frame matching facility processing steps with methods for cost
-        # calculation over time
-        _step_cost = self.step_costs[
-            ["step", "step_cost_method", "facility_id", "connects"]
-        ].loc[self.step_costs.facility_id == _id]
+        _id = facility["facility_id"]
 
-        _step_cost["timeout"] = 1
+        # facility-specific attributes shared by every node in the facility
+        _facility_attrs = {k: v for k, v in facility.items() if k != "facility_id"}
 
-        # create list of dictionaries from data frame with processing steps,
-        # cost calculation method, and facility-specific region identifiers
-        _attr_data = _step_cost.merge(
-            facility_df, how="outer", on="facility_id"
-        ).to_dict(orient="records")
-
-        # reformat data into a list of tuples as (str, dict)
-        _nodes = self.list_of_tuples(self.get_node_names(_id, _node_names), _attr_data)
+        # list of (str, dict) tuples combining the processing steps, cost
+        # calculation method, and facility-specific region identifiers
+        _nodes = [
+            (
+                f"{_step_cost['step']}_{_id}",
+                {**_step_cost, "timeout": 1, **_facility_attrs},
+            )
+            for _step_cost in self._step_costs_by_facility.get(_id, [])
+        ]
 
         return _nodes
 
-    def build_facility_graph(self, facility_df: pd.DataFrame):
+    def get_facility_nodes_and_edges(self, facility: dict):
         """
-        Creates networkx DiGraph object containing nodes, intra-facility edges,
-        and all relevant attributes for a single facility.
+        Generates the nodes, intra-facility edges, and all relevant attributes
+        for a single facility, in the form accepted by networkx add_nodes_from
+        and add_edges_from.
 
         Parameters
         ----------
-        facility_df : pd.DataFrame
-            DataFrame with a single row that defines a supply chain facility.
+        facility : dict
+            Dictionary of attributes that defines a supply chain facility.
 
-            Columns:
+            Keys:
                 - facility_id : int
                 - facility_type : str
                 - lat : float
@@ -449,61 +523,47 @@ class CostGraph:
 
         Returns
         -------
-        networkx.DiGraph
-            Directed graph representation of one supply chain facility.
+        List[(str, Dict)]
+            Node names and attribute dictionaries for the facility.
+        List[(str, str, Dict)]
+            Intra-facility edges and their attribute dictionaries.
         """
         if self.verbose > 1:
             print(
                 "Building facility graph for ",
-                str(facility_df["facility_id"].values[0]),
+                str(facility["facility_id"]),
             )
 
-        # Create empty directed graph object
-        _facility = nx.DiGraph()
-
-        _id = str(facility_df["facility_id"].values[0])
-
         # Generates list of (str, dict) tuples for node definition
-        _facility_nodes = self.get_nodes(facility_df)
+        _facility_nodes = self.get_nodes(facility)
+        _node_attrs = dict(_facility_nodes)
 
-        # Populate the directed graph with node names and attribute
-        # dictionaries
-        _facility.add_nodes_from(_facility_nodes)
-
-        # Populate the directed graph with edges
         # Edges within facilities don't have transportation costs or distances
         # associated with them.
-        _edges = self.get_edges(facility_df)
-        _unique_edges = [tuple(map(lambda w: w + "_" + _id, x)) for x in _edges]
-
-        _methods = [
-            {
-                "cost_method": [
-                    getattr(
-                        self.cost_methods, _facility.nodes[edge[0]]["step_cost_method"]
-                    )
-                ],
-                "cost": 0.0,
-                "dist": 0.0,
-                "route_id": None,
-            }
-            for edge in _unique_edges
-        ]
-
-        _facility.add_edges_from(
-            self.list_of_tuples(
-                [node[0] for node in _unique_edges],
-                [node[1] for node in _unique_edges],
-                _methods,
+        _facility_edges = [
+            (
+                _u,
+                _v,
+                {
+                    "cost_method": [
+                        getattr(
+                            self.cost_methods, _node_attrs[_u]["step_cost_method"]
+                        )
+                    ],
+                    "cost": 0.0,
+                    "dist": 0.0,
+                    "route_id": None,
+                },
             )
-        )
+            for _u, _v in self.get_edges(facility)
+        ]
 
-        return _facility
+        return _facility_nodes, _facility_edges
 
     def build_supplychain_graph(self):
         """
-        Reads in the locations data set line by line. Each line becomes a
-        DiGraph representing a single facility. Facility DiGraphs are
+        Iterates over the locations data set row by row. Each row defines the
+        nodes and edges of a single facility. Facility nodes and edges are
         added onto a supply chain DiGraph and connected with inter-facility
         edges. Edges within facilities have no cost or distance. Edges
         between facilities have costs defined in the interconnections
@@ -512,181 +572,165 @@ class CostGraph:
         if self.verbose > 0:
             print(
                 "Adding nodes and edges at        %d s"
-                % np.round(time() - self.start_time, 0),
+                % self.elapsed_time(),
                 flush=True,
             )
 
-        # add all facilities and intra-facility edges to supply chain
-        with open(self.loc_file, "r") as _loc_file:
+        _phase_start = perf_counter()
 
-            _reader = pd.read_csv(_loc_file, chunksize=1)
+        # add all facilities and intra-facility edges to supply chain, using
+        # the locations already read in at instantiation
+        _nodes = []
+        _edges = []
+        for _facility in self.loc_df.to_dict(orient="records"):
+            _fac_nodes, _fac_edges = self.get_facility_nodes_and_edges(
+                facility=_facility
+            )
+            _nodes.extend(_fac_nodes)
+            _edges.extend(_fac_edges)
 
-            for _line in _reader:
+        # add onto the supply chain graph all at once
+        self.supply_chain.add_nodes_from(_nodes)
+        self.supply_chain.add_edges_from(_edges)
 
-                # Build the subgraph representation and add it to the list of
-                # facility subgraphs
-                _fac_graph = self.build_facility_graph(facility_df=_line)
+        # index the nodes by step and facility ID
+        self.index_nodes()
 
-                # add onto the supply supply chain graph
-                self.supply_chain.add_nodes_from(_fac_graph.nodes(data=True))
-                self.supply_chain.add_edges_from(_fac_graph.edges(data=True))
+        self.report_phase("Adding nodes and edges", _phase_start)
 
         if self.verbose > 0:
             print(
                 "Nodes and edges added at         %d s"
-                % np.round(time() - self.start_time, 0),
+                % self.elapsed_time(),
                 flush=True,
             )
             print(
                 "Adding transport cost methods at %d s"
-                % np.round(time() - self.start_time, 0),
+                % self.elapsed_time(),
                 flush=True,
             )
 
+        _phase_start = perf_counter()
+
         # add all inter-facility edges, with costs but without distances
-        # this is a relatively short loop
-        for index, row in self.transpo_edges.iterrows():
+        # this is a relatively short loop, and the edges from every row are
+        # added onto the supply chain at once
+        _transpo_edges = []
+        for row in self.transpo_edges.itertuples(index=False):
             if self.verbose > 1:
                 print(
                     "Adding transport cost methods to edges between ",
-                    row["u_step"],
+                    row.u_step,
                     " and ",
-                    row["v_step"],
+                    row.v_step,
                 )
 
-            _u = row["u_step"]
-            _v = row["v_step"]
-            _transpo_cost = row["transpo_cost_method"]
+            _u = row.u_step
+            _v = row.v_step
+            _transpo_cost = getattr(self.cost_methods, row.transpo_cost_method)
 
             # get two lists of nodes to connect based on df row
-            _u_nodes = list(search_nodes(self.supply_chain, {"==": [("step",), _u]}))
-            _v_nodes = list(search_nodes(self.supply_chain, {"==": [("step",), _v]}))
+            _u_nodes = self._step_index.get(_u, [])
+            _v_nodes = self._step_index.get(_v, [])
 
-            # convert the two node lists to a list of tuples with all possible
-            # combinations of _u_nodes and _v_nodes
-            _edge_list = self.all_element_combos(_u_nodes, _v_nodes)
+            # every _v node has step _v, so the destination processing cost is
+            # included only if _v is an end of the supply chain
+            _v_is_end = _v in self.sc_end
 
-            if not any(
-                [self.supply_chain.nodes[_v]["step"] in self.sc_end for _v in _v_nodes]
-            ):
-                _methods = [
-                    {
-                        "cost_method": [
-                            getattr(
-                                self.cost_methods,
-                                self.supply_chain.nodes[edge[0]]["step_cost_method"],
-                            ),
-                            getattr(self.cost_methods, _transpo_cost),
-                        ],
-                        "cost": 0.0,
-                        "dist": -1.0,
-                        "route_id": None,
-                    }
-                    for edge in _edge_list
-                ]
-            else:
-                _methods = [
-                    {
-                        "cost_method": [
-                            getattr(
-                                self.cost_methods,
-                                self.supply_chain.nodes[edge[0]]["step_cost_method"],
-                            ),
-                            getattr(self.cost_methods, _transpo_cost),
-                            getattr(
-                                self.cost_methods,
-                                self.supply_chain.nodes[edge[1]]["step_cost_method"],
-                            ),
-                        ],
-                        "cost": 0.0,
-                        "dist": -1.0,
-                        "route_id": None,
-                    }
-                    for edge in _edge_list
+            # all possible combinations of _u_nodes and _v_nodes
+            for _u_node, _v_node in self.all_element_combos(_u_nodes, _v_nodes):
+                _cost_method = [
+                    getattr(
+                        self.cost_methods,
+                        self.supply_chain.nodes[_u_node]["step_cost_method"],
+                    ),
+                    _transpo_cost,
                 ]
-
-            # add these edges to the supply chain
-            self.supply_chain.add_edges_from(
-                self.list_of_tuples(
-                    [edge[0] for edge in _edge_list],
-                    [edge[1] for edge in _edge_list],
-                    _methods,
+                if _v_is_end:
+                    _cost_method.append(
+                        getattr(
+                            self.cost_methods,
+                            self.supply_chain.nodes[_v_node]["step_cost_method"],
+                        )
+                    )
+                _transpo_edges.append(
+                    (
+                        _u_node,
+                        _v_node,
+                        {
+                            "cost_method": _cost_method,
+                            "cost": 0.0,
+                            "dist": -1.0,
+                            "route_id": None,
+                        },
+                    )
                 )
-            )
+
+        # add these edges to the supply chain
+        self.supply_chain.add_edges_from(_transpo_edges)
+
+        self.report_phase("Adding transport cost methods", _phase_start)
+
         if self.verbose > 0:
             print(
                 "Transport cost methods added at  %d s"
-                % np.round(time() - self.start_time, 0),
+                % self.elapsed_time(),
                 flush=True,
             )
-        # read in and process routes line by line
-        with open(self.routes_file, "r") as _route_file:
-            if self.verbose > 0:
-                print(
-                    "Adding route distances at        %d s"
-                    % np.round(time() - self.start_time, 0),
-                    flush=True,
-                )
-
-            # Only read in columns relevant to CostGraph building
-            _reader = pd.read_csv(
-                _route_file,
-                usecols=[
-                    "source_facility_id",
-                    "source_facility_type",
-                    "destination_facility_id",
-                    "destination_facility_type",
-                    "total_vkmt",
-                    "route_id",
-                ],
-                chunksize=1,
+        if self.verbose > 0:
+            print(
+                "Adding route distances at        %d s"
+                % self.elapsed_time(),
+                flush=True,
             )
-            _prev_line = None
 
-            for _line in _reader:
-                if np.array_equal(_line, _prev_line):
-                    continue
+        _phase_start = perf_counter()
+
+        # Only read in columns relevant to CostGraph building
+        _routes = pd.read_csv(
+            self.routes_file,
+            usecols=[
+                "source_facility_id",
+                "source_facility_type",
+                "destination_facility_id",
+                "destination_facility_type",
+                "total_vkmt",
+                "route_id",
+            ],
+        )
 
-                _prev_line = _line
+        # The routes dataset has one line per road segment type along each
+        # route, so consecutive lines are often identical; skip repeats
+        _routes = _routes[(_routes != _routes.shift()).any(axis=1)]
 
-                # find the source nodes for this route
-                _u = list(
-                    search_nodes(
-                        self.supply_chain,
-                        {
-                            "and": [
-                                {
-                                    "==": [
-                                        ("facility_id",),
-                                        _line["source_facility_id"].values[0],
-                                    ]
-                                },
-                                {"in": [("connects",), ["out", "bid"]]},
-                            ]
-                        },
-                    )
-                )
+        for _line in _routes.itertuples(index=False):
+            # find the source nodes for this route
+            _u = [
+                _node
+                for _node in self._facility_index.get(_line.source_facility_id, [])
+                if self.supply_chain.nodes[_node]["connects"] in {"out", "bid"}
+            ]
 
-                # loop thru all edges that connect to the source nodes
-                for u_node, v_node, data in self.supply_chain.edges(_u, data=True):
-                    # if the destination node facility ID matches the
-                    # destination facility ID in the routing dataset row,
-                    # apply the distance from the routing dataset to this edge
-                    if (
-                        self.supply_chain.nodes[v_node]["facility_id"]
-                        == _line["destination_facility_id"].values[0]
-                    ):
-                        if self.verbose > 1:
-                            print(
-                                "Adding ",
-                                str(_line["total_vkmt"].values[0]),
-                                " km between ",
-                                u_node,
-                                " and ",
-                                v_node,
-                            )
-                        data["dist"] = _line["total_vkmt"].values[0]
-                        data["route_id"] = _line["route_id"].values[0]
+            # loop thru all edges that connect to the source nodes
+            for u_node, v_node, data in self.supply_chain.edges(_u, data=True):
+                # if the destination node facility ID matches the
+                # destination facility ID in the routing dataset row,
+                # apply the distance from the routing dataset to this edge
+                if (
+                    self.supply_chain.nodes[v_node]["facility_id"]
+                    == _line.destination_facility_id
+                ):
+                    if self.verbose > 1:
+                        print(
+                            "Adding ",
+                            str(_line.total_vkmt),
+                            " km between ",
+                            u_node,
+                            " and ",
+                            v_node,
+                        )
+                    data["dist"] = _line.total_vkmt
+                    data["route_id"] = _line.route_id
 
         # After all of the route distances have been added, any edges that
         # have a distance of -1 km are deleted from the network.
@@ -698,18 +742,23 @@ class CostGraph:
                     print(f"Removing edge between {u} and {v}")
                 _remove_edges.append((u, v))
         self.supply_chain.remove_edges_from(_remove_edges)
+
+        self.report_phase("Adding route distances", _phase_start)
+
         if self.verbose > 0:
             print(
                 "Route distances added at         %d s"
-                % np.round(time() - self.start_time, 0),
+                % self.elapsed_time(),
                 flush=True,
             )
             print(
                 "Calculating edge costs at        %d s"
-                % np.round(time() - self.start_time, 0),
+                % self.elapsed_time(),
                 flush=True,
             )
 
+        _phase_start = perf_counter()
+
         for edge in self.supply_chain.edges():
             if self.verbose > 1:
                 print("Calculating edge costs for ", edge)
@@ -727,10 +776,12 @@ class CostGraph:
                 print(f'CostGraph: A cost method assigned to {edge} is returning None', flush=True)
                 raise TypeError 
 
+        self.report_phase("Calculating edge costs", _phase_start)
+
         if self.verbose > 0:
             print(
                 "Supply chain graph is built at   %d s"
-                % np.round(time() - self.start_time, 0),
+                % self.elapsed_time(),
                 flush=True,
             )
 
@@ -803,21 +854,23 @@ class CostGraph:
             connect to any nodes of the connect_to type.
         """
 
-        # Check that the node_id exists in the supply chain.
-        # If it doesn't, print a message and return None
-        if (
-            not node_id
-            in nx.get_node_attributes(self.supply_chain, name="facility_id").values()
-        ):
+        # Check that the node_id exists in the supply chain and pull out the
+        # name of its "bid" node.
+        _node = None
+        _exists = node_id in self._facility_index
+        for x in self._facility_index.get(node_id, []):
+            if self.supply_chain.nodes[x]["connects"] == "bid":
+                _node = x
+                break
+
+        # If it doesn't exist, print a message and return None
+        if not _exists:
             print("Facility %d does not exist in CostGraph" % node_id, flush=True)
             return None
-        else:
-            # If node_id does exist in the supply chain, pull out the node name
-            _node = [
-                x
-                for x, y in self.supply_chain.nodes(data=True)
-                if y["facility_id"] == node_id and y["connects"] == "bid"
-            ][0]
+        elif _node is None:
+            raise ValueError(
+                f"CostGraph.find_upstream_neighbor: facility {node_id} has no bid node"
+            )
 
         # Get a list of all nodes with an outgoing edge that connects to this
         # node_id, with the specified facility type
@@ -853,6 +906,37 @@ class CostGraph:
         # Return the "closest" node's facility_id as an integer
         return int(_nearest_facility_id)
 
+    def find_upstream_neighbors(
+        self, node_ids, connect_to: str = "manufacturing", crit: str = "dist"
+    ) -> dict:
+        """
+        Find the "nearest" upstream neighbor of type connect_to for each of
+        several nodes, looking up each distinct node only once.
+
+        Parameters
+        ----------
+        node_ids : iterable of int
+            facility_ids of nodes in the supply chain network. May contain
+            repeated IDs.
+        connect_to : str
+            facility_type of the upstream nodes.
+        crit : str
+            Criteron used to decide which upstream node is "nearest".
+            Defaults to distance.
+
+        Returns
+        -------
+        Dict[int, int]
+            The result of find_upstream_neighbor for each distinct node_id,
+            keyed by node_id.
+        """
+        return {
+            int(_id): self.find_upstream_neighbor(
+                int(_id), connect_to=connect_to, crit=crit
+            )
+            for _id in np.unique(node_ids)
+        }
+
     def find_downstream(
         self,
         node_name: str = None,
@@ -894,22 +978,13 @@ class CostGraph:
         # If it doesn't, print a message and return None
         # if a facility_id was provided, use that to locate the node
         if facility_id is not None:
-            if (
-                not facility_id
-                in nx.get_node_attributes(
-                    self.supply_chain, name="facility_id"
-                ).values()
-            ):
+            if not facility_id in self._facility_index:
                 print(f"Facility {facility_id} does not exist in CostGraph", flush=True)
                 return None
             else:
                 # If facility_id does exist in the supply chain, pull out the
                 # node name
-                _node = [
-                    x
-                    for x, y in self.supply_chain.nodes(data=True)
-                    if y["facility_id"] == facility_id
-                ][0]
+                _node = self._facility_index[facility_id][0]
                 # Get a list of all nodes with an outgoing edge that connects
                 # to this facility_id, with the specified facility type
                 _downst_nodes = [
@@ -1035,7 +1110,7 @@ class CostGraph:
         if self.verbose > 0:
             print(
                 "Updating costs for %d at         %d s"
-                % (path_dict["year"], np.round(time() - self.start_time, 0)),
+                % (path_dict["year"], self.elapsed_time()),
                 flush=True,
             )
 
@@ -1049,10 +1124,47 @@ class CostGraph:
         if self.verbose > 0:
             print(
                 "Costs updated for  %d at         %d s"
-                % (path_dict["year"], np.round(time() - self.start_time, 0)),
+                % (path_dict["year"], self.elapsed_time()),
                 flush=True,
             )
 
+    def reset_for_run(
+        self, run: int, year: int, component_mass: float, random_state=None
+    ):
+        """
+        Prepare the CostGraph for another model run without rebuilding the
+        supply chain graph.
+
+        The run number, model year and component mass are reset, all edge
+        costs are re-calculated for that year, and the pathway cost history
+        of the previous run is discarded. If a random number generator is
+        provided, the cost methods draw from it for this run.
+
+        Parameters
+        ----------
+        run : int
+            Model run number.
+
+        year : int
+            Model year the run starts in.
+
+        component_mass : float
+            Initial component mass, in tonnes, used by the cost methods.
+
+        random_state : np.random.default_rng
+            Random number generator for the cost methods in this run. Defaults
+            to None, in which case the current generator is kept.
+        """
+        self.run = run
+        self.cost_methods.run = run
+        if random_state is not None:
+            self.cost_methods.seed = random_state
+        self.year = year
+        self.path_dict["year"] = year
+        self.path_dict["component mass"] = component_mass
+        self.update_costs(self.path_dict)
+        self.pathway_crit_history = list()
+
     def save_costgraph_outputs(self):
         """
         Performs postprocessing on CostGraph outputs being saved to file and
@@ -14,12 +14,14 @@ Unmodified FPEAM code is available at https://github.com/NREL/fpeam.
 import pandas as pd
 
 
-class Data(pd.DataFrame):
+class Data:
     """
     Data representation. Specific datasets are created as child classes with
     defined column names, data types, and backfilling values. Creating child
     classes removes the need to define column names etc when the classes are
     called to read data from files.
+
+    The data itself is held as a plain DataFrame in the df attribute.
     """
 
     COLUMNS = []
@@ -37,14 +39,21 @@ class Data(pd.DataFrame):
             Filepath location of data to be read in
 
         columns
-            List of columns to backfill
+            Dictionary of column names and data types to read in. Defaults to
+            the names and types listed in COLUMNS.
 
         backfill
             Boolean flag: perform backfilling with datatype-specific value
         """
-        _df = pd.DataFrame({}) if df is None and fpath is None else self.load(fpath=fpath,
-                                                                              columns=columns)
-        super(Data, self).__init__(data=_df)
+        if columns is None:
+            columns = self._dtypes()
+
+        if fpath is not None:
+            self.df = self.load(fpath=fpath, columns=columns)
+        elif df is not None:
+            self.df = df
+        else:
+            self.df = pd.DataFrame({})
 
         self.source = fpath or 'DataFrame'
 
@@ -63,6 +72,17 @@ class Data(pd.DataFrame):
                 if _column['backfill'] is not None:
                     self.backfill(column=_column['name'], value=_column['backfill'])
 
+    @classmethod
+    def _dtypes(cls):
+        """
+        Map each column name in COLUMNS to its data type.
+
+        Returns
+        -------
+        Dictionary of {name: type, ...}
+        """
+        return {d['name']: d['type'] for d in cls.COLUMNS}
+
     def load(self, fpath, columns, memory_map=True, header=0, **kwargs):
         """
         Load data from a text file at <fpath>. Check and set column names.
@@ -92,11 +112,10 @@ class Data(pd.DataFrame):
             _df = pd.read_csv(filepath_or_buffer=fpath, sep=',', dtype=columns,
                               usecols=columns.keys(), memory_map=memory_map, header=header, **kwargs)
         except ValueError as e:
-            if e.__str__() == 'Usecols do not match names.':
-                from collections import Counter
-                _df = pd.read_table(filepath_or_buffer=fpath, sep=',', dtype=columns,
-                                    memory_map=memory_map, header=header, **kwargs)
-                _df_columns = Counter(_df.columns)
+            if e.__str__().startswith('Usecols do not match'):
+                # only the header is needed to find the missing columns
+                _df_columns = pd.read_csv(filepath_or_buffer=fpath, sep=',', header=header,
+                                          nrows=0).columns
                 _cols = list(set(columns.keys()) - set(_df_columns))
                 raise ValueError('%(f)s missing columns: %(cols)s' % (dict(f=fpath, cols=_cols)))
             else:
@@ -126,15 +145,19 @@ class Data(pd.DataFrame):
 
         _backfilled = False
 
+        # find the missing values once and reuse the mask
+        _missing = self.df[column].isna().values
+
+        # count the missing values
+        _count_missing = int(_missing.sum())
+
         # if any values are missing,
-        if self[column].isna().any():
-            # count the missing values
-            _count_missing = sum(self[column].isna())
+        if _count_missing > 0:
             # count the total values
-            _count_total = self[column].__len__()
+            _count_total = len(_missing)
 
             # fill the missing values with specified value
-            self[column].fillna(value, inplace=True)
+            self.df[column] = self.df[column].fillna(value)
 
             # log a warning with the number of missing values
             print('%s of %s data values in %s.%s were backfilled as %s' % (_count_missing, _count_total, _dataset, column, value))
@@ -163,7 +186,7 @@ class Data(pd.DataFrame):
 
         print('validating %s' % (_name, ))
 
-        if self.empty:
+        if self.df.empty:
             print('no data provided for %s' % (_name, ))
             _valid = False
 
@@ -197,7 +220,7 @@ class TransportationGraph(Data):
                {'name': 'fclass', 'type': int, 'index': False, 'backfill': None})
 
     def __init__(self, df=None, fpath=None,
-                 columns={d['name']: d['type'] for d in COLUMNS},
+                 columns=None,
                  backfill=True):
         super(TransportationGraph, self).__init__(df=df, fpath=fpath, columns=columns,
                                                   backfill=backfill)
@@ -212,7 +235,7 @@ class TransportationNodeLocations(Data):
                {'name': 'lat', 'type': float, 'index': False, 'backfill': None})
 
     def __init__(self, df=None, fpath=None,
-                 columns={d['name']: d['type'] for d in COLUMNS},
+                 columns=None,
                  backfill=True):
         super(TransportationNodeLocations, self).__init__(df=df, fpath=fpath, columns=columns,
                                                           backfill=backfill)
@@ -234,7 +257,7 @@ class Locations(Data):
                )
 
     def __init__(self, df=None, fpath=None,
-                 columns={d['name']: d['type'] for d in COLUMNS},
+                 columns=None,
                  backfill=True):
         super(Locations, self).__init__(df=df, fpath=fpath, columns=columns,
                                                           backfill=backfill)
@@ -263,7 +286,7 @@ class TechUnitLocations(Data):
                )
 
     def __init__(self, df=None, fpath=None,
-                 columns={d['name']: d['type'] for d in COLUMNS},
+                 columns=None,
                  backfill=True):
         super(TechUnitLocations, self).__init__(df=df, fpath=fpath, columns=columns,
                                                 backfill=backfill)
@@ -284,7 +307,7 @@ class OtherFacilityLocations(Data):
                )
 
     def __init__(self, df=None, fpath=None,
-                 columns={d['name']: d['type'] for d in COLUMNS},
+                 columns=None,
                  backfill=True):
         super(OtherFacilityLocations, self).__init__(df=df, fpath=fpath, columns=columns,
                                                backfill=backfill)
@@ -306,7 +329,7 @@ class LandfillLocations(Data):
                )
 
     def __init__(self, df=None, fpath=None,
-                 columns={d['name']: d['type'] for d in COLUMNS},
+                 columns=None,
                  backfill=True):
         super(LandfillLocations, self).__init__(df=df, fpath=fpath, columns=columns,
                                                backfill=backfill)
@@ -333,7 +356,7 @@ class StandardScenarios(Data):
                )
 
     def __init__(self, df=None, fpath=None,
-                 columns={d['name']: d['type'] for d in COLUMNS},
+                 columns=None,
                  backfill=True):
         super(StandardScenarios, self).__init__(df=df, fpath=fpath, columns=columns,
                                                backfill=backfill)
@@ -351,7 +374,7 @@ class RoutePairs(Data):
                )
 
     def __init__(self, df=None, fpath=None,
-                 columns={d['name']: d['type'] for d in COLUMNS},
+                 columns=None,
                  backfill=True):
         super(RoutePairs,self).__init__(df=df, fpath=fpath, columns=columns,
                                         backfill=backfill)
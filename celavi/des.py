@@ -189,6 +189,10 @@ class Context:
         self.lca = lca
         self.cost_graph_update_interval_timesteps = cost_graph_update_interval_timesteps
 
+        # Pathway choices only change when the CostGraph costs are updated,
+        # so they are cached by source node between updates.
+        self._path_cache: Dict[str, List[Dict]] = {}
+
         self.data_for_lci: List[Dict[str, float]] = []
         self.verbose = verbose
 
@@ -239,6 +243,16 @@ class Context:
         choices about the component's lifecycle are made as further processes
         time out and decisions are made at subsequent timesteps.
 
+        Components that share a kind, year, manufacturing and in use facility
+        and lifespan follow identical lifecycles, so they are grouped into
+        cohorts and each cohort is simulated by a single Component instance
+        (and SimPy process) that moves all of its components at once.
+
+        Rather than every process waiting in the SimPy event queue from
+        timestep zero until its cohort begins life, cohorts are bucketed by
+        the timestep in which they begin life, and a single timeout per bucket
+        starts all of that bucket's processes.
+
         Parameters
         ----------
         df: pd.DataFrame
@@ -264,25 +278,84 @@ class Context:
             value in a way similar to the following: lifespan_fns[row["kind"]]()
         """
 
-        for _, row in df.iterrows():
-            year = row["year"]
+        # Sample one lifespan per component, in row order, before grouping.
+        # Lifespans are truncated to integer timesteps, as in Component.
+        cohort_cols = [
+            "kind",
+            "year",
+            "manuf_facility_id",
+            "in_use_facility_id",
+            "lifespan_timesteps",
+        ]
+        cohorts = (
+            df.assign(
+                lifespan_timesteps=[int(lifespan_fns[kind]()) for kind in df["kind"]]
+            )
+            .groupby(cohort_cols, sort=False, dropna=False)
+            .size()
+            .reset_index(name="n_components")
+        )
+
+        bol_buckets: Dict[int, List[Component]] = {}
+
+        for row in cohorts.itertuples(index=False):
             mass_tonnes = {
-                material: self.component_material_mass_tonne_dict[material][year]
+                material: self.component_material_mass_tonne_dict[material][row.year]
                 for material in self.possible_materials
             }
 
             component = Component(
-                kind=row["kind"],
-                year=year,
-                manuf_facility_id=row["manuf_facility_id"],
-                in_use_facility_id=row["in_use_facility_id"],
+                kind=row.kind,
+                year=row.year,
+                manuf_facility_id=row.manuf_facility_id,
+                in_use_facility_id=row.in_use_facility_id,
                 context=self,
-                lifespan_timesteps=lifespan_fns[row["kind"]](),
+                lifespan_timesteps=row.lifespan_timesteps,
                 mass_tonnes=mass_tonnes,
+                n_components=row.n_components,
             )
-            self.env.process(component.bol_process(self.env))
+            begin_timestep = (row.year - self.min_year) * self.timesteps_per_year
+            bol_buckets.setdefault(begin_timestep, []).append(component)
             self.components.append(component)
 
+        for begin_timestep, bucket in bol_buckets.items():
+            self.env.timeout(begin_timestep).callbacks.append(
+                lambda _event, bucket=bucket: self.begin_life(bucket)
+            )
+
+    def begin_life(self, bucket: List[Component]):
+        """
+        Start the beginning of life process for every component in a bucket of
+        components that begin life at the current timestep.
+
+        Parameters
+        ----------
+        bucket: List[Component]
+            Components whose beginning of life is the current timestep, in the
+            order their processes should start.
+        """
+        for component in bucket:
+            self.env.process(component.bol_process(self.env))
+
+    def get_cached_paths(self, source: str) -> List[Dict]:
+        """
+        Return the CostGraph pathway choices from a source node, computing
+        them only once per cost graph update interval.
+
+        Parameters
+        ----------
+        source: str
+            Node name in the format "facilitytype_facilityid".
+
+        Returns
+        -------
+        List[Dict]
+            The pathway choices returned by CostGraph.choose_paths().
+        """
+        if source not in self._path_cache:
+            self._path_cache[source] = self.cost_graph.choose_paths(source=source)
+        return self._path_cache[source]
+
     def cumulative_mass_for_component_in_process_at_timestep(
         self, component_kind: str, process_name: List[str], timestep: int
     ):
@@ -353,38 +426,27 @@ class Context:
 
             for facility_name, facility in self.mass_facility_inventories.items():
                 process_name, facility_id = facility_name.split("_")
-                for material in self.possible_materials:
-                    annual_transactions = facility.transaction_history.loc[
-                        window_first_timestep:window_last_timestep, material
-                    ]
-                    sliced_info = facility.transaction_history.loc[
-                        window_first_timestep:window_last_timestep,
-                        [material, "timestep"],
-                    ].reset_index()
-
-                    sliced_info["year"] = (
-                        sliced_info["timestep"] / self.timesteps_per_year
-                        + self.min_year
-                    )
-                    actual_year = int(
-                        floor(
-                            self.timesteps_to_years(
-                                sliced_info["timestep"][self.timesteps_per_year // 2]
-                            )
+                # Slice the window from the transaction record array directly
+                # rather than building a transaction history DataFrame for
+                # every material.
+                window = facility.transactions[
+                    window_first_timestep : window_last_timestep + 1
+                ]
+                window_actual_year = int(
+                    floor(
+                        self.timesteps_to_years(
+                            window["timestep"][self.timesteps_per_year // 2]
                         )
                     )
-                    problematic_value = sliced_info[material][self.timesteps_per_year]
+                )
+                for material in self.possible_materials:
+                    annual_transactions = window[material]
+                    actual_year = window_actual_year
+                    problematic_value = annual_transactions[self.timesteps_per_year]
 
                     # A problematic value is when mass is reported in the last time step of a sliced dataframe
                     # which belongs to the next year. Generally this happens only for manufacturing.
                     if problematic_value > 0:
-                        problem_year = int(
-                            floor(
-                                self.timesteps_to_years(
-                                    sliced_info["timestep"][self.timesteps_per_year]
-                                )
-                            )
-                        )
                         actual_year = actual_year + 1
 
                     # If the facility is NOT manufacturing, keep only positive transactions
@@ -397,9 +459,6 @@ class Context:
                         positive_annual_transactions = annual_transactions
                     mass_tonnes = positive_annual_transactions.sum()
 
-                    if mass_tonnes > 0:
-                        sliced_info["facility_name"] = facility_name
-                        sliced_info["facility_id"] = facility_id
                     mass_kg = mass_tonnes * 1000
                     if mass_kg > 0:
                         row = {
@@ -540,6 +599,8 @@ class Context:
                         timestep=env.now,
                     )
                 self.cost_graph.update_costs(_path_dict)
+                # Costs have changed, so previously chosen paths are stale
+                self._path_cache.clear()
 
     def run(self) -> Dict[str, FacilityInventory]:
         """
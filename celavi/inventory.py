@@ -58,18 +58,25 @@ class FacilityInventory:
         for possible_item in possible_items:
             self.component_materials[possible_item] = 0.0
 
-        self.transactions: List[Dict[str, float]] = []
-        for timestep in range(timesteps):
-            component_materials_copy = self.component_materials.copy()
-            component_materials_copy["timestep"] = timestep
-            self.transactions.append(component_materials_copy)
-        # Populate the deposit-only history with copies of the
-        # initialized dictionary from above that has all values set to 0.0
-        self.input_transactions: List[Dict[str, float]] = []
-        for timestep in range(timesteps):
-            component_materials_copy = self.component_materials.copy()
-            component_materials_copy["timestep"] = timestep
-            self.input_transactions.append(component_materials_copy)
+        # The transaction histories are preallocated record arrays with one
+        # row per timestep and one float field per item, plus the timestep.
+        # Indexing a row by item name, as in transactions[5]["item"], works
+        # as it would on a list of dictionaries.
+        history_dtype = [(item, np.float64) for item in self.component_materials]
+        history_dtype.append(("timestep", np.int64))
+
+        self.transactions = np.zeros(timesteps, dtype=history_dtype)
+        self.transactions["timestep"] = np.arange(timesteps)
+        # Populate the deposit-only history with the same all-zero layout
+        self.input_transactions = self.transactions.copy()
+
+        # Views onto each item's field for fast single-element updates
+        self._transaction_columns: Dict[str, np.ndarray] = {
+            item: self.transactions[item] for item in self.component_materials
+        }
+        self._input_transaction_columns: Dict[str, np.ndarray] = {
+            item: self.input_transactions[item] for item in self.component_materials
+        }
 
     def increment_quantity(
         self, item_name: str, quantity: float, timestep: int
@@ -107,12 +114,12 @@ class FacilityInventory:
         """
         # Place this transaction in the history
         timestep = int(timestep)
-        self.transactions[timestep][item_name] += quantity
+        self._transaction_columns[item_name][timestep] += quantity
 
         # Only if the quantity is an input, attach the transaction to the
         # input transactions table
         if quantity > 0:
-            self.input_transactions[timestep][item_name] += quantity
+            self._input_transaction_columns[item_name][timestep] += quantity
 
         # Now increment the inventory
         self.component_materials[item_name] += quantity
@@ -122,12 +129,56 @@ class FacilityInventory:
             and not self.can_be_negative
         ):
             raise ValueError(
-                f"Inventory {self.name} cannot go negative. {self.component_materials[item_name]}"
+                f"Inventory {self.step}_{self.facility_id} cannot go negative. {self.component_materials[item_name]}"
             )
 
         # Return the new level
         return self.component_materials[item_name]
 
+    def increment_quantities(
+        self, quantities: Dict[str, float], timestep: int, scale: float = 1.0
+    ):
+        """
+        Changes the quantities of several items in this inventory at once.
+
+        This is equivalent to calling increment_quantity() once per item, but
+        converts the timestep only once. It is used to move all the materials
+        of a component with a single call.
+
+        Parameters
+        ----------
+        quantities: Dict[str, float]
+            Keys are item names and values are the quantities of each item,
+            either positive or negative.
+
+        timestep: int
+            The timestep of this deposit or withdrawal.
+
+        scale: float
+            Multiplier applied to every quantity, for example the number
+            of components being moved, or a negative number for withdrawals.
+            Defaults to 1.
+        """
+        timestep = int(timestep)
+        transaction_columns = self._transaction_columns
+        input_transaction_columns = self._input_transaction_columns
+        component_materials = self.component_materials
+
+        for item_name, quantity in quantities.items():
+            quantity = scale * quantity
+            transaction_columns[item_name][timestep] += quantity
+            if quantity > 0:
+                input_transaction_columns[item_name][timestep] += quantity
+            component_materials[item_name] += quantity
+
+            if (
+                round(component_materials[item_name], 2) < 0
+                and not self.can_be_negative
+            ):
+                raise ValueError(
+                    f"Inventory {self.step}_{self.facility_id} cannot go negative. {component_materials[item_name]}"
+                )
+
     @property
     def cumulative_history(self) -> pd.DataFrame:
         """
@@ -144,13 +195,7 @@ class FacilityInventory:
             The cumulative history of all the transactions of the component
             materials.
         """
-        component_materials_history_df = pd.DataFrame(self.transactions)
-        cumulative_history = pd.DataFrame()
-        for column in component_materials_history_df.columns:
-            cumulative_history[column] = np.cumsum(
-                component_materials_history_df[column].values
-            )
-        return cumulative_history
+        return self._cumulative(self.transactions)
 
     @property
     def cumulative_input_history(self) -> pd.DataFrame:
@@ -164,19 +209,31 @@ class FacilityInventory:
             The cumulative history of all the transactions of the component
             materials.
         """
-        component_materials_history_df = pd.DataFrame(self.input_transactions)
-        cumulative_history = pd.DataFrame()
-        for column in component_materials_history_df.columns:
-            cumulative_history[column] = np.cumsum(
-                component_materials_history_df[column].values
-            )
-        return cumulative_history
+        return self._cumulative(self.input_transactions)
+
+    @staticmethod
+    def _cumulative(history: np.ndarray) -> pd.DataFrame:
+        """
+        Cumulatively sum every field of a transaction history record array.
+
+        Parameters
+        ----------
+        history: np.ndarray
+            Record array with one row per timestep.
+
+        Returns
+        -------
+        pd.DataFrame
+            Running totals of each field, one column per field.
+        """
+        return pd.DataFrame(
+            {column: np.cumsum(history[column]) for column in history.dtype.names}
+        )
 
     @property
     def transaction_history(self) -> pd.DataFrame:
         """
-        Convert a dictionary of transactions at this facility into a
-        DataFrame.
+        Convert the transactions at this facility into a DataFrame.
 
         Because this method instantiates a DataFrame, it should be called
         sparingly, as this is a resource consuming procedure.
@@ -192,8 +249,7 @@ class FacilityInventory:
     @property
     def input_transaction_history(self) -> pd.DataFrame:
         """
-        Convert a dictionary of input transactions at this facility
-        into a DataFrame.
+        Convert the input transactions at this facility into a DataFrame.
         
         Because this method instantiates a DataFrame, it should be called
         sparingly, as this is a resource consuming procedure.
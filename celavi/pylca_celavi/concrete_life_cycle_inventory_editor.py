@@ -1,5 +1,44 @@
+from functools import lru_cache
+
 import pandas as pd
 
+
+@lru_cache(maxsize=None)
+def _read_inventory(filename):
+    """
+    Read an inventory file once per process. The inventory files are model
+    inputs and are not modified during a run.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the inventory file.
+
+    Returns
+    -------
+    pd.DataFrame
+        Inventory read from the file. Callers must not modify it.
+    """
+    return pd.read_csv(filename)
+
+
+def read_inventory(filename):
+    """
+    Return a copy of an inventory file that callers are free to modify.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the inventory file.
+
+    Returns
+    -------
+    pd.DataFrame
+        Inventory read from the file.
+    """
+    return _read_inventory(filename).copy()
+
+
 def concrete_life_cycle_inventory_updater(d_f,
                                           yr,
                                           k,
@@ -48,7 +87,7 @@ def concrete_life_cycle_inventory_updater(d_f,
 
     #The problem of concrete emission where emission is dependant upon the value of glass fiber available in the system'
     elif k == 'concrete':
-        df_static = pd.read_csv(static_filename)
+        df_static = read_inventory(static_filename)
         year_of_concrete_demand = yr
 
         # Reading gfrp storage variable in pickle from previous runs
@@ -108,13 +147,13 @@ def concrete_life_cycle_inventory_updater(d_f,
         new_co2_emission_factor = 0.00092699 / 0.0096291 * new_coal_inventory_factor
         # These numbers are all obtained from the inventory which says that the use of 0.0096291 kg coal will cause 0.000926 kg Co2 emission
         # This co2 emission only includes the coal combustion impact factor. Other fuels need to be added separately
-        df_emissions = pd.read_csv(emissions_filename)
+        df_emissions = read_inventory(emissions_filename)
         df_emissions.loc[((df_emissions['product'] == 'carbon dioxide') & (df_emissions['process'] == 'concrete, in use')),'value'] = new_co2_emission_factor
         df_static['route_id'] = None
         df_emissions['route_id'] = None
         return df_static,df_emissions
 
     else:
-        df_static = pd.read_csv(static_filename)
-        df_emissions = pd.read_csv(emissions_filename)
+        df_static = read_inventory(static_filename)
+        df_emissions = read_inventory(emissions_filename)
         return df_static,df_emissions
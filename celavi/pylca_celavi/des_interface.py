@@ -95,16 +95,85 @@ class PylcaCelavi:
         self.substitution_rate = substitution_rate
         self.run = run
 
+        # In-memory copy of the shortcut LCA file, and the file size and
+        # modification time it was read at
+        self._shortcut_db = None
+        self._shortcut_db_key = None
+
         # The results file should be removed if present. The LCA results are appended to the results file. 
-        try:
+        if os.path.isfile(self.lcia_des_filename):
             os.remove(self.lcia_des_filename)
             if self.verbose == 1:
                 print(f"PylcaCelavi: Deleted {self.lcia_des_filename}")
+        elif self.verbose == 1:
+            print(f"PyLCIA: {self.lcia_des_filename} not found")
+
+    def read_shortcut_db(self, columns):
+        """
+        Read the shortcut LCA file, reusing the previously read copy if the
+        file has not changed since.
+
+        Parameters
+        ----------
+        columns: list
+            Column names assigned to the shortcut LCA data.
+
+        Returns
+        -------
+        pandas.DataFrame
+            De-duplicated emission factors from the shortcut LCA file.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the shortcut LCA file does not exist.
+        """
+        _stat = os.stat(self.shortcutlca_filename)
+        _key = (_stat.st_mtime_ns, _stat.st_size, tuple(columns))
+        if self._shortcut_db is None or self._shortcut_db_key != _key:
+            db = pd.read_csv(self.shortcutlca_filename)
+            db.columns = columns
+            self._shortcut_db = db.drop_duplicates()
+            self._shortcut_db_key = _key
+        return self._shortcut_db
+
+    def append_shortcut_db(self, lca_db):
+        """
+        Append newly calculated emission factors to the shortcut LCA file and
+        to the in-memory copy, if that copy is up to date with the file.
+
+        Parameters
+        ----------
+        lca_db: pandas.DataFrame
+            Emission factors with the same columns as the shortcut LCA file.
+        """
+        try:
+            _stat = os.stat(self.shortcutlca_filename)
+            _key = (_stat.st_mtime_ns, _stat.st_size, tuple(lca_db.columns))
         except FileNotFoundError:
-            if self.verbose == 1:
-                print(f"PyLCIA: {self.lcia_des_filename} not found")
+            _key = None
+
+        lca_db.to_csv(
+            self.shortcutlca_filename,
+            mode="a",
+            index=False,
+            header=False,
+        )
+
+        if _key is not None and self._shortcut_db_key == _key:
+            # Appending the rows to the de-duplicated copy and de-duplicating
+            # again gives the same table as re-reading the file
+            self._shortcut_db = pd.concat(
+                [self._shortcut_db, lca_db], ignore_index=True
+            ).drop_duplicates()
+            _stat = os.stat(self.shortcutlca_filename)
+            self._shortcut_db_key = (
+                _stat.st_mtime_ns,
+                _stat.st_size,
+                tuple(lca_db.columns),
+            )
 
-    def lca_performance_improvement(self, df, state, electricity_grid_spatial_level):
+    def lca_performance_improvement(self, df, state, electricity_grid_spatial_level, db=None):
         """
         This function is used to bypass pylca celavi calculations
         It reads emission factor data from previous runs stored in a file
@@ -133,11 +202,17 @@ class PylcaCelavi:
 
         electricity_grid_spatial_level : str
             Specification of grid spatial level used for lca calculations. Must be "state" or "national".
+
+        db : pandas.DataFrame
+            Emission factors to use instead of the shortcut LCA file, with the
+            same columns as the shortcut LCA file. Defaults to None, in which
+            case the shortcut LCA file is read.
         
         Returns
         -------
         pandas.DataFrame, pandas.DataFrame
-            Emission results using the shortcut calculations and another dataframe with the flows that do not have any emission results.
+            The rows of df that do not have any emission factors in the shortcut LCA file, with all of
+            the columns of df, and the emission results using the shortcut calculations.
             Columns:
                 - year: int
                     Model year.
@@ -172,40 +247,41 @@ class PylcaCelavi:
                 - route_id: str
                     UUID of transportation route.
         """
-        try:
-            if electricity_grid_spatial_level != 'state':
-                db= pd.read_csv(self.shortcutlca_filename)
-                db.columns = ['year', 'stage', 'material', 'flow name', 'emission factor kg/kg']
-                db = db.drop_duplicates()
-                df2 = df.merge(db, on = ['year', 'stage', 'material'], how = 'outer',indicator = True)
-                df_with_lca_entry = df2[df2['_merge'] == 'both'].drop_duplicates()
-            else:
-                db= pd.read_csv(self.shortcutlca_filename)
-                db.columns = ['year', 'stage', 'material', 'state','flow name', 'emission factor kg/kg']
-                db = db.drop_duplicates()
-                df2 = df.merge(db, on = ['year', 'stage', 'material','state'], how = 'outer',indicator = True)
-                df_with_lca_entry = df2[df2['_merge'] == 'both'].drop_duplicates()   
-
-            
-            df_with_no_lca_entry =  df2[df2['_merge'] == 'left_only']
-            df_with_no_lca_entry = df_with_no_lca_entry.drop_duplicates()
-            
-            try:
-                df_with_no_lca_entry = df_with_no_lca_entry[['year', 'facility_id', 'flow quantity', 'stage', 'state', 'material', 'flow unit']]  
-            except:
-                df_with_no_lca_entry = df_with_no_lca_entry[['year', 'facility_id', 'flow quantity', 'stage', 'material', 'flow unit']]  
-
-            df_with_lca_entry['flow quantity'] = df_with_lca_entry['flow quantity'] * df_with_lca_entry['emission factor kg/kg']
-            df_with_lca_entry = df_with_lca_entry[['flow name', 'flow unit', 'flow quantity', 'year', 'facility_id', 'stage', 'material', 'route_id','state']]
-            result_shortcut = impact_calculations(df_with_lca_entry,self.traci_lci_filename)
-            
-            return df_with_no_lca_entry, result_shortcut
+        if electricity_grid_spatial_level != 'state':
+            key = ['year', 'stage', 'material']
+        else:
+            key = ['year', 'stage', 'material', 'state']
 
-        except FileNotFoundError:
+        if db is None:
+            if (
+                not os.path.isfile(self.shortcutlca_filename)
+                or os.path.getsize(self.shortcutlca_filename) == 0
+            ):
+                if self.verbose == 1:
+                    print("No existing shortcut LCA file:" + self.shortcutlca_filename)
+                return df, pd.DataFrame()
+            db = self.read_shortcut_db(key + ['flow name', 'emission factor kg/kg'])
 
-            if self.verbose == 1:
-                print("No existing shortcut LCA file:" + self.shortcutlca_filename)
-            return df, pd.DataFrame()
+        # db is already free of duplicate lines. The merged rows are not
+        # de-duplicated: identical DES rows are separate flows and each one
+        # carries its own emissions.
+        df_with_lca_entry = df.merge(db, on = key, how = 'inner', sort = False)
+
+        # Rows without an emission factor keep all of their columns and
+        # values, so they can be passed on to the LCA pipeline as they are
+        _has_entry = pd.MultiIndex.from_frame(df[key]).isin(
+            pd.MultiIndex.from_frame(db[key])
+        )
+        df_with_no_lca_entry = df[~_has_entry]
+
+        df_with_lca_entry['flow quantity'] = (
+            df_with_lca_entry['flow quantity'].to_numpy()
+            * df_with_lca_entry['emission factor kg/kg'].to_numpy()
+        )
+        df_with_lca_entry = df_with_lca_entry[['flow name', 'flow unit', 'flow quantity', 'year', 'facility_id', 'stage', 'material', 'route_id','state']]
+        result_shortcut = impact_calculations(df_with_lca_entry,self.traci_lci_filename)
+
+        return df_with_no_lca_entry, result_shortcut
 
     def pylca_run_main(self, df, verbose=0):
         """
@@ -231,30 +307,38 @@ class PylcaCelavi:
                 - impacts: str
                 - impact: float
         """
-        df = df[df["flow quantity"] != 0]
-        res_df = pd.DataFrame()
-        df = df.reset_index()
-        lcia_mass_flow = pd.DataFrame()
+        df = df.iloc[df["flow quantity"].to_numpy() != 0].reset_index(drop=True)
+        # LCIA results are collected into a list and concatenated once
+        res_chunks = []
         states = list(pd.unique(df["state"]))
 
+        if self.use_shortcut_lca_calculations:
+            # The shortcut calculations are done for the whole batch at once,
+            # leaving only the rows without emission factors to loop over.
+            df, result_shortcut = self.lca_performance_improvement(df, None, self.electricity_grid_spatial_level)
+            res_chunks.append(result_shortcut)
+        # Emission factors calculated in this batch are written to the
+        # shortcut LCA file once, after the loop. Until then they are kept in
+        # new_lca_db, because they may cover rows later in the batch.
+        lca_db_chunks = []
+        new_lca_db = None
+
         # The LCA needs to be done for every region separately. Thus separating the states in the dataframe.
         for st in states:
             df_s = df[df["state"] == st]
 
             # This function breaks down the df sent from DES to individual rows with unique rows, facilityID, stage and materials.
-            for index, row in df_s.iterrows():
+            for i, row in enumerate(df_s.to_dict("records")):
                 year = row["year"]
                 stage = row["stage"]
                 material = row["material"]
                 facility_id = row["facility_id"]
                 route_id = row["route_id"]
                 state = row["state"]
-                new_df = df_s[df_s["index"] == index]
+                new_df = df_s.iloc[[i]]
 
-                if self.use_shortcut_lca_calculations:
-                    #Calling the lca performance improvement function to do shortcut calculations. 
-                    df_with_no_lca_entry,result_shortcut = self.lca_performance_improvement(new_df,state,self.electricity_grid_spatial_level)
-                    df_with_no_lca_entry['route_id'] = route_id #the lca performance improvement removes routes id. 
+                if new_lca_db is not None:
+                    df_with_no_lca_entry,result_shortcut = self.lca_performance_improvement(new_df,state,self.electricity_grid_spatial_level,db=new_lca_db)
                 else:
                     df_with_no_lca_entry = new_df
                     result_shortcut = pd.DataFrame()
@@ -274,11 +358,14 @@ class PylcaCelavi:
 
                     if not df_static.empty:
 
-                        working_df = df_with_no_lca_entry
-                        working_df["flow name"] = (
-                            working_df["material"] + ", " + working_df["stage"]
+                        working_df = pd.DataFrame(
+                            {
+                                "flow name": df_with_no_lca_entry["material"]
+                                + ", "
+                                + df_with_no_lca_entry["stage"],
+                                "flow quantity": df_with_no_lca_entry["flow quantity"],
+                            }
                         )
-                        working_df = working_df[["flow name", "flow quantity"]]
 
                         if sum(working_df["flow quantity"]) != 0:
 
@@ -314,31 +401,38 @@ class PylcaCelavi:
                                 res = model_celavi_lci_background(res,year,facility_id,stage,material,route_id,state,self.uslci_tech_filename,self.uslci_emission_filename,self.uslci_process_filename,self.verbose)
                                 lci = postprocessing(res,emission,self.verbose)
                                 res = impact_calculations(lci,self.traci_lci_filename)
-                                res_df = pd.concat([res_df,res])
-
-                                lcia_mass_flow = lci
-                                del df_with_no_lca_entry['route_id']
-                                del lcia_mass_flow['route_id']
-                                
-                                df_with_no_lca_entry = df_with_no_lca_entry.drop(['flow name'],axis = 1)
-                                lca_db = df_with_no_lca_entry.merge(lcia_mass_flow,on = ['year','stage','material','state'])
-                                lca_db['emission factor kg/kg'] = lca_db['flow quantity_y']/lca_db['flow quantity_x']  
-                                
-                                if self.electricity_grid_spatial_level == 'state':
-                                    lca_db['state'] = state
-                                    lca_db = lca_db[['year','stage','material','state','flow name','emission factor kg/kg']]
-                                else: 
-                                    lca_db = lca_db[['year','stage','material','flow name','emission factor kg/kg']]
+                                res_chunks.append(res)
+
+                                # Emission factors per unit of this row's flow, from the
+                                # LCI flows calculated for the same year, stage, material
+                                # and state
+                                _flows = lci[
+                                    (lci['year'] == year)
+                                    & (lci['stage'] == stage)
+                                    & (lci['material'] == material)
+                                    & (lci['state'] == state)
+                                ]
+                                lca_db = pd.DataFrame(
+                                    {
+                                        'year': year,
+                                        'stage': stage,
+                                        'material': material,
+                                        'state': state,
+                                        'flow name': _flows['flow name'].to_numpy(),
+                                        'emission factor kg/kg': _flows['flow quantity'].to_numpy() / row['flow quantity'],
+                                    }
+                                )
+                                if self.electricity_grid_spatial_level != 'state':
+                                    lca_db = lca_db.drop(columns = ['state'])
 
                                 lca_db = lca_db[lca_db['material'] != 'concrete']
                                 lca_db['year'] = lca_db['year'].astype(int)
                                 lca_db = lca_db.drop_duplicates()
-                                lca_db.to_csv(
-                                    self.shortcutlca_filename,
-                                    mode="a",
-                                    index=False,
-                                    header=False,
-                                )
+                                lca_db_chunks.append(lca_db)
+                                if self.use_shortcut_lca_calculations:
+                                    new_lca_db = pd.concat(
+                                        [new_lca_db, lca_db], ignore_index=True
+                                    ).drop_duplicates()
                             else:
                                 if verbose > 0:
                                     print(
@@ -355,18 +449,26 @@ class PylcaCelavi:
                     if self.verbose == 1:
                         print(str(facility_id) + ' - ' + str(year) + ' - ' + stage + ' - ' + material + ' shortcut calculations done',flush = True)    
     
-                res_df = pd.concat([res_df,result_shortcut])
+                res_chunks.append(result_shortcut)
+
+        if lca_db_chunks:
+            self.append_shortcut_db(
+                pd.concat(lca_db_chunks, ignore_index=True).drop_duplicates()
+            )
+
+        # Empty results are left out, so that they do not take part in the
+        # dtype inference of the concatenated results
+        res_chunks = [_res for _res in res_chunks if not _res.empty]
+        res_df = pd.concat(res_chunks) if res_chunks else pd.DataFrame()
         
-        #Correcting the units for LCIA results. 
-        for index,row in res_df.iterrows():
-            a = row['impacts']
-            try:
-                split_string = a.split("/kg", 1)
-                res_df = res_df.replace(a, split_string[0] + split_string[1])
-
-            except:
-                split_string = a.split("/ kg", 1)
-                res_df = res_df.replace(a, split_string[0] + split_string[1])
+        #Correcting the units for LCIA results by removing the first "/kg",
+        # or the first "/ kg" if there is no "/kg".
+        if not res_df.empty:
+            _impacts = res_df['impacts']
+            _has_kg = _impacts.str.contains("/kg", regex=False)
+            res_df['impacts'] = _impacts.str.replace("/kg", "", n=1, regex=False).where(
+                _has_kg, _impacts.str.replace("/ kg", "", n=1, regex=False)
+            )
 
         # The line below is just for debugging if needed
         res_df["run"] = self.run
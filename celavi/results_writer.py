@@ -0,0 +1,76 @@
+from typing import Dict
+
+import pandas as pd
+
+
+class ResultsWriter:
+    """
+    The ResultsWriter class appends the results of each model run to the
+    results CSV files of a scenario. Each results file is opened the first
+    time it is written to and stays open until close() is called.
+    """
+
+    def __init__(self, files: Dict[str, str]):
+        """
+        Parameters
+        ----------
+        files: Dict[str, str]
+            Paths to the results files, keyed by results file name. The
+            dictionary is read when a file is first written to, so it can be
+            filled in after the writer is created.
+        """
+        self.files = files
+        # Open results files, by results file name
+        self._open_files = {}
+        # Whether the column names still need to be written to each results
+        # file
+        self._header_needed = {}
+        # The last model run written to each results file
+        self._last_run = {}
+
+    def write(self, name: str, df: pd.DataFrame, run: int):
+        """
+        Append a DataFrame to a results CSV file. The column names are only
+        written if the file is empty.
+
+        The DataFrame is converted to CSV text in memory and written with a
+        single call.
+
+        Parameters
+        ----------
+        name: str
+            Key of the results file in files.
+
+        df: pd.DataFrame
+            Results to append.
+
+        run: int
+            Model run that the results belong to.
+
+        Raises
+        ------
+        ValueError
+            If results were already written to this file for the same model
+            run.
+        """
+        if self._last_run.get(name) == run:
+            raise ValueError(f"{name} results were already written for run {run}")
+        self._last_run[name] = run
+
+        if name not in self._open_files:
+            # The CSV text already has platform line endings, so newlines are
+            # not translated again when writing
+            f = open(self.files[name], "a", newline="")
+            self._open_files[name] = f
+            self._header_needed[name] = f.tell() == 0
+        self._open_files[name].write(
+            df.to_csv(index=False, header=self._header_needed[name])
+        )
+        self._header_needed[name] = False
+
+    def close(self):
+        """Close all results files opened by write()."""
+        for f in self._open_files.values():
+            f.close()
+        self._open_files = {}
+        self._header_needed = {}
@@ -178,10 +178,10 @@ class Router:
         # import transportation graph and node locations
         _transportation_graph = Data.TransportationGraph(
             fpath=transportation_graph, backfill=backfill
-        )
+        ).df
         _node_locations = Data.TransportationNodeLocations(
             fpath=node_locations, backfill=backfill
-        )
+        ).df
 
         # create temporary file directory
         _temp_dir = tempfile.mkdtemp()
@@ -195,7 +195,7 @@ class Router:
 
         # import locations data
         locations = pd.read_csv(locations_file)
-        route_pairs = Data.RoutePairs(fpath=route_pair_file, backfill=backfill)
+        route_pairs = Data.RoutePairs(fpath=route_pair_file, backfill=backfill).df
         # Get a list of destination facility types that must be in-state
         # from route_pairs
         _instate_dest = (
@@ -4,6 +4,7 @@ Created January 27, 2022.
 @author: rhanes
 """
 from dataclasses import replace
+import io
 import re
 import os
 import time
@@ -25,8 +26,40 @@ from celavi.pylca_celavi.des_interface import PylcaCelavi
 from celavi.reeds_importer import ReedsImporter
 from celavi.des import Context
 from celavi.diagnostic_viz import DiagnosticViz
+from celavi.results_writer import ResultsWriter
 
+# Use the libyaml C parser for config files when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
+# Read and write the CostGraph pickle through a 1 MB buffer
+PICKLE_BUFFER_SIZE = 1 << 20
+
+# Units in LCIA impact names, in parentheses or in square brackets
+UNITS_PAREN_PATTERN = re.compile(r"\(.*\)")
+UNITS_SQUARE_PATTERN = re.compile(r"\[.*\]")
+
+# Translation table that deletes the brackets around units
+UNITS_BRACKETS_TABLE = str.maketrans("", "", "()[]")
+
+
+def _as_list(value):
+    """
+    Place a single config value into its own list.
+
+    Parameters
+    ----------
+    value
+        A list, a single value, or None for a blank config entry.
+
+    Returns
+    -------
+    list
+        The value if it is already a list, an empty list if the value is
+        blank, otherwise a list holding the value.
+    """
+    if isinstance(value, list):
+        return value
+    return [value] if value else []
 
 
 class Scenario:
@@ -53,28 +86,30 @@ class Scenario:
         self.args = parser.parse_args()
 
         # Get the configuration information as two dictionaries
+        casestudy_filename = os.path.join(self.args.data, self.args.casestudy)
         try:
-            with open(
-                os.path.join(self.args.data, self.args.casestudy), "r", encoding="utf-8"
-            ) as f:
-                self.case = yaml.load(f, Loader=yaml.FullLoader)
+            with open(casestudy_filename, "r", encoding="utf-8") as f:
+                self.case = yaml.load(f, Loader=YAML_LOADER)
         except IOError:
-            print(
-                f"Could not open {os.path.join(self.args.data, self.args.casestudy)} for configuration."
-            )
+            print(f"Could not open {casestudy_filename} for configuration.")
             raise
         try:
             self.scenario_filename = os.path.join(self.args.data, self.args.scenario)
             with open(self.scenario_filename, "r", encoding="utf-8") as f:
-                self.scen = yaml.load(f, Loader=yaml.FullLoader)
+                self.scen = yaml.load(f, Loader=YAML_LOADER)
         except IOError:
-            print(
-                f"Could not open {os.path.join(self.args.data, self.args.scenario)} for configuration."
-            )
+            print(f"Could not open {self.scenario_filename} for configuration.")
             raise
 
         self.files = {}
         self.routes = pd.DataFrame()
+        # Total component masses, read on first use and shared by all runs
+        self._component_total_mass = None
+        # Results files appended to by postprocess()
+        self.results_writer = ResultsWriter(self.files)
+        # Position in the LCIA results file up to which earlier runs'
+        # results have already been read
+        self._lcia_offset = 0
 
         # Create holders for the three CELAVI components
         self.context = None
@@ -83,10 +118,18 @@ class Scenario:
 
         # Start at model run 0
         self.run = 0
-        # Record start time of this scenario
-        self.start = self.simtime(0.0)
-        # Create a random number generator with a user-defined seed
-        self.rng = np.random.default_rng(self.scen["scenario"]["seed"])
+        # Record start time of this scenario on the monotonic clock, which
+        # simtime() measures elapsed time against
+        self.start = time.monotonic()
+        # Create an independent random number generator for each model run,
+        # spawned from the user-defined seed, so that the random draws of a
+        # run do not depend on how many draws earlier runs made
+        self.run_rngs = [
+            np.random.default_rng(_seed)
+            for _seed in np.random.SeedSequence(self.scen["scenario"]["seed"]).spawn(
+                self.scen["scenario"]["runs"]
+            )
+        ]
 
         print(f"Preprocessing starting at {self.simtime(self.start)} s", flush=True)
 
@@ -105,19 +148,22 @@ class Scenario:
         # Execute all model runs
         # Subtract one from the number of runs in the config file because
         # arange includes zero in the list
-        for i in np.arange(self.scen["scenario"]["runs"]):
-            time0 = time.time()
-            self.run = i
-            self.execute()
-
-            print(
-                f"Creating diagnostic visualizations for run {i} at {self.simtime(self.start)} s",
-                flush=True,
-            )
+        try:
+            for i in np.arange(self.scen["scenario"]["runs"]):
+                time0 = time.time()
+                self.run = i
+                self.execute()
+
+                print(
+                    f"Creating diagnostic visualizations for run {i} at {self.simtime(self.start)} s",
+                    flush=True,
+                )
 
-            # Postprocess and save the output of a single model run
-            self.postprocess()
-            print(f'Run {i} took {str(time.time()-time0)} seconds', flush = True)
+                # Postprocess and save the output of a single model run
+                self.postprocess()
+                print(f'Run {i} took {str(time.time()-time0)} seconds', flush = True)
+        finally:
+            self.results_writer.close()
 
         # Print run finish message
         print(f"FINISHED SIMULATION at {self.simtime(self.start)} s", flush=True)
@@ -132,13 +178,16 @@ class Scenario:
             Raises exception if necessary filepaths do not exist.
         """
         for _dir, _fdict in self.case["files"].items():
+            # Resolve the directory root once for all of its files
+            _root = os.path.join(self.args.data, self.case["directories"][_dir])
+
             # Create the directory if it doesn't exist
-            if not os.path.isdir(
-                os.path.join(self.args.data, self.case["directories"][_dir])
-            ):
-                os.makedirs(
-                    os.path.join(self.args.data, self.case["directories"][_dir])
-                )
+            if not os.path.isdir(_root):
+                os.makedirs(_root)
+
+            # List the directory once instead of checking every file in it
+            with os.scandir(_root) as _entries:
+                _present = {_entry.name for _entry in _entries if _entry.is_file()}
 
             for _n, _f in _fdict.items():
                 # Capacity projection file is a scenario parameter and must be
@@ -146,16 +195,15 @@ class Scenario:
                 if _n == "capacity_projection":
                     _f = self.scen["scenario"].get("capacity_projection")
 
-                _p = os.path.join(self.args.data, self.case["directories"][_dir], _f)
-                if not os.path.isfile(_p) and dir in [
-                    "inputs_to_preprocessing",
-                    "inputs",
-                    "quality_checks",
-                ]:
-                    raise Exception(
-                        f"{_f} in {os.path.join(self.args.data, _dir)} "
-                        f"does not exist"
-                    )
+                _p = os.path.join(_root, _f)
+                # Files in subdirectories are not in the listing and are
+                # checked individually
+                if (
+                    _dir in ["inputs_to_preprocessing", "inputs", "quality_checks"]
+                    and _f not in _present
+                    and not os.path.isfile(_p)
+                ):
+                    raise Exception(f"{_f} in {_root} does not exist")
                 self.files[_n] = _p
 
     def preprocess(self):
@@ -228,17 +276,41 @@ class Scenario:
 
         print(f"Run routes completed in {self.simtime(self.start)} s", flush=True)
 
+    def get_component_total_mass(self):
+        """
+        Read the component material masses and total them by component, for
+        the model start year.
+
+        The file is only read the first time this method is called; later
+        calls return the same totals.
+
+        Returns
+        -------
+        pd.Series
+            Total component mass in tonnes in the start year, indexed by
+            year, technology, and component.
+        """
+        if self._component_total_mass is None:
+            start_year = self.case["model_run"].get("start_year")
+            component_material_mass = pd.read_csv(
+                self.files["component_material_mass"],
+                usecols=["year", "technology", "component", "mass_tonnes"],
+            )
+            # Only the start year masses are used, so the other years are
+            # dropped before grouping
+            component_material_mass = component_material_mass[
+                component_material_mass["year"] == start_year
+            ]
+            self._component_total_mass = component_material_mass.groupby(
+                by=["year", "technology", "component"]
+            )["mass_tonnes"].sum()
+        return self._component_total_mass
+
     def setup(self):
         """Create instances of CostGraph, DES (Context and Components) and PyLCIA."""
         start_year = self.case["model_run"].get("start_year")
 
-        component_material_mass = pd.read_csv(self.files["component_material_mass"])
-
-        component_total_mass = (
-            component_material_mass.groupby(by=["year", "technology", "component"])
-            .sum("mass_tonnes")
-            .reset_index()
-        )
+        component_total_mass = self.get_component_total_mass()
 
         circular_components = self.scen["technology_components"].get(
             "circular_components"
@@ -268,21 +340,25 @@ class Scenario:
                 save_name=self.files["costgraph_csv"],
                 pathway_crit_history_filename=self.files["pathway_criterion_history"],
                 circular_components=circular_components,
-                component_initial_mass=component_total_mass.loc[
-                    component_total_mass.year == start_year, "mass_tonnes"
-                ].values[0],
+                component_initial_mass=component_total_mass.loc[start_year].iloc[0],
                 path_dict=self.scen["circular_pathways"],
-                random_state=self.rng,
+                random_state=self.run_rngs[self.run],
                 run=self.run,
             )
             print(f"CostGraph initialized at {self.simtime(self.start)}", flush=True)
 
             if self.scen["flags"].get("pickle_costgraph", True):
                 # Save the CostGraph object using pickle
-                pickle.dump(self.netw, open(self.files["costgraph_pickle"], "wb"))
+                with open(
+                    self.files["costgraph_pickle"], "wb", buffering=PICKLE_BUFFER_SIZE
+                ) as f:
+                    pickle.dump(self.netw, f, protocol=pickle.HIGHEST_PROTOCOL)
 
         else:
-            self.netw = pickle.load(open(self.files["costgraph_pickle"], "rb"))
+            with open(
+                self.files["costgraph_pickle"], "rb", buffering=PICKLE_BUFFER_SIZE
+            ) as f:
+                self.netw = pickle.load(f)
             print(f"CostGraph read in at {self.simtime(self.start)}", flush=True)
 
         # Electricity spatial mix level. Defaults to 'state' when not provided.
@@ -340,26 +416,17 @@ class Scenario:
         """Execute one model run within the scenario."""
         start_year = self.case["model_run"].get("start_year")
 
-        component_material_mass = pd.read_csv(self.files["component_material_mass"])
-
-        component_total_mass = (
-            component_material_mass.groupby(by=["year", "technology", "component"])
-            .sum("mass_tonnes")
-            .reset_index()
-        )
+        component_total_mass = self.get_component_total_mass()
 
         # Reset key CostGraph internal parameters to avoid re-initializing
         # from scratch.
         if self.run > 0:
-            self.netw.run = self.run
-            self.netw.cost_methods.run = self.run
-            self.netw.year = start_year
-            self.netw.path_dict["year"] = start_year
-            self.netw.path_dict["component mass"] = component_total_mass.loc[
-                component_total_mass.year == start_year, "mass_tonnes"
-            ].values[0]
-            self.netw.update_costs(self.netw.path_dict)
-            self.netw.pathway_crit_history = list()
+            self.netw.reset_for_run(
+                run=self.run,
+                year=start_year,
+                component_mass=component_total_mass.loc[start_year].iloc[0],
+                random_state=self.run_rngs[self.run],
+            )
 
             self.lca.run = self.run
 
@@ -409,28 +476,34 @@ class Scenario:
 
         # Create the technology dataframe that will be used to populate
         # the context with components.
-        technology_data = pd.read_csv(self.files["technology_data"])
-        components = []
-        for _, row in technology_data.iterrows():
-            year = row["year"]
-            in_use_facility_id = int(row["facility_id"])
-            manuf_facility_id = self.netw.find_upstream_neighbor(
-                int(row["facility_id"])
-            )
-            n_technology = int(row["n_technology"])
+        # Only these columns are needed. n_technology is written as a float
+        # (it is rounded up with np.ceil) so it is parsed as one.
+        technology_data = pd.read_csv(
+            self.files["technology_data"],
+            usecols=["year", "facility_id", "n_technology"],
+            dtype={"n_technology": np.float64},
+        )
+        in_use_facility_ids = technology_data["facility_id"].to_numpy().astype(np.int64)
 
-            for _ in range(n_technology):
-                for c in circular_components:
-                    components.append(
-                        {
-                            "year": year,
-                            "kind": c,
-                            "manuf_facility_id": manuf_facility_id,
-                            "in_use_facility_id": in_use_facility_id,
-                        }
-                    )
+        # Look up the manufacturing facility once per unique in-use facility
+        # rather than once per row of technology data
+        fac_map = self.netw.find_upstream_neighbors(in_use_facility_ids)
+        manuf_facility_ids = np.array(
+            [fac_map[fid] for fid in in_use_facility_ids], dtype=object
+        )
 
-        components = pd.DataFrame(components)
+        # Each row of technology data expands to n_technology units, and each
+        # unit contributes one of every circular component
+        n_technology = technology_data["n_technology"].to_numpy().astype(np.int64)
+        counts = n_technology * len(circular_components)
+        components = pd.DataFrame(
+            {
+                "year": np.repeat(technology_data["year"].to_numpy(), counts),
+                "kind": np.tile(circular_components, n_technology.sum()),
+                "manuf_facility_id": np.repeat(manuf_facility_ids, counts),
+                "in_use_facility_id": np.repeat(in_use_facility_ids, counts),
+            }
+        )
 
         # Create the lifespan functions for the components.
         lifespan_fns = {}
@@ -439,33 +512,37 @@ class Scenario:
         for component in (
             self.scen["technology_components"].get("component_list").keys()
         ):
+            # The lifespan in timesteps is computed once, when the function
+            # is defined
             lifespan_fns[component] = (
                 lambda steps=apply_array_uncertainty(
                     self.scen["technology_components"].get("component_fixed_lifetimes")[
                         component
                     ],
                     self.run,
-                ), convert=timesteps_per_year: steps
-                * convert
+                )
+                * timesteps_per_year: steps
             )
 
         # If fixed lifetimes are not being used, then apply the Weibull parameters
         # to the circular component(s) only. All non-circular components keep their
         # fixed lifetimes.
+        # Lifespans are sampled in bulk, one per component of each kind, and the
+        # lifespan function hands them out in order.
         if not self.scen["flags"].get("use_fixed_lifetime", True):
+            min_lifespan = self.case["model_run"].get("min_lifespan")
+            weibull_params = self.scen["technology_components"].get(
+                "component_weibull_params"
+            )
             for c in circular_components:
-                lifespan_fns[c] = lambda: weibull_min.rvs(
-                    self.scen["technology_components"].get("component_weibull_params")[
-                        c
-                    ]["K"],
-                    loc=self.case["model_run"].get("min_lifespan"),
-                    scale=self.scen["technology_components"].get(
-                        "component_weibull_params"
-                    )[c]["L"]
-                    - self.case["model_run"].get("min_lifespan"),
-                    size=1,
-                    random_state=self.rng,
-                )[0]
+                lifespans = weibull_min.rvs(
+                    weibull_params[c]["K"],
+                    loc=min_lifespan,
+                    scale=weibull_params[c]["L"] - min_lifespan,
+                    size=int((components["kind"] == c).sum()),
+                    random_state=self.run_rngs[self.run],
+                )
+                lifespan_fns[c] = lambda it=iter(lifespans): next(it)
 
         print(f"Components initialized at {self.simtime(self.start)} s", flush=True)
 
@@ -514,10 +591,7 @@ class Scenario:
             diagnostic_viz_counts.gather_and_melt_cumulative_histories()
         )
 
-        with open(self.files["count_cumulative_histories"], "a") as f:
-            count_cumulative_histories.to_csv(
-                f, mode="a", header=f.tell() == 0, index=False, line_terminator="\n"
-            )
+        self.results_writer.write("count_cumulative_histories", count_cumulative_histories, self.run)
 
         diagnostic_viz_counts.generate_plots()
 
@@ -555,7 +629,16 @@ class Scenario:
             "impact_value",
             "run",
         ]
-        lcia_df = pd.read_csv(self.files["lcia_to_des"], names=lcia_names)
+        # The LCIA results file holds the results of all runs so far. Only
+        # the part appended since the previous run is read.
+        with open(self.files["lcia_to_des"], "rb") as f:
+            f.seek(self._lcia_offset)
+            lcia_content = f.read()
+            self._lcia_offset = f.tell()
+        if lcia_content:
+            lcia_df = pd.read_csv(io.BytesIO(lcia_content), names=lcia_names)
+        else:
+            lcia_df = pd.DataFrame(columns=lcia_names)
         locations_df = pd.read_csv(self.files["locs"])
 
         locations_columns = [
@@ -577,10 +660,7 @@ class Scenario:
             locations_select_df, how="inner", on="facility_id"
         ).drop_duplicates()
 
-        with open(self.files["lcia_facility_results"], "a") as f:
-            lcia_locations_df.to_csv(
-                f, index=False, mode="a", header=f.tell() == 0, line_terminator="\n"
-            )
+        self.results_writer.write("lcia_facility_results", lcia_locations_df, self.run)
 
         # Create and save LCIA results for transportation, by route county
         lcia_transpo = (
@@ -650,17 +730,22 @@ class Scenario:
 
         # Summarize log files into one place.
 
-        lcia_summary = []
-        for _, row in lcia_locations_df.iterrows():
-            impact, units = self.impact_and_units(row["impact"])
-            summary_row = {
-                "units": units,
-                "name": impact,
-                "value": row["impact_value"],
+        # Split each distinct impact string into its name and units once
+        impact_names_units = {
+            _impact: self.impact_and_units(_impact)
+            for _impact in lcia_locations_df["impact"].unique()
+        }
+        lcia_summary = pd.DataFrame(
+            {
+                "units": lcia_locations_df["impact"].map(
+                    {_k: _v[1] for _k, _v in impact_names_units.items()}
+                ),
+                "name": lcia_locations_df["impact"].map(
+                    {_k: _v[0] for _k, _v in impact_names_units.items()}
+                ),
+                "value": lcia_locations_df["impact_value"],
             }
-            lcia_summary.append(summary_row)
-
-        lcia_summary = pd.DataFrame(lcia_summary)
+        )
         lcia_summary = lcia_summary.groupby(["units", "name"]).sum().reset_index()
         lcia_summary["seed"] = seed
         lcia_summary["run"] = run
@@ -713,25 +798,11 @@ class Scenario:
 
         # Write all postprocessed log files.
 
-        with open(self.files["mass_cumulative_histories"], "a") as f:
-            mass_cumulative_histories.to_csv(
-                f, mode="a", header=f.tell() == 0, index=False, line_terminator="\n"
-            )
-
-        with open(self.files["lcia_transpo_results"], "a") as f:
-            lcia_transpo_agg.to_csv(
-                f, index=False, mode="a", header=f.tell() == 0, line_terminator="\n"
-            )
+        self.results_writer.write("mass_cumulative_histories", mass_cumulative_histories, self.run)
 
-        with open(self.files["lcia_transpo_results"], "a") as f:
-            lcia_transpo_agg.to_csv(
-                f, index=False, mode="a", header=f.tell() == 0, line_terminator="\n"
-            )
+        self.results_writer.write("lcia_transpo_results", lcia_transpo_agg, self.run)
 
-        with open(self.files["central_summary"], "a") as f:
-            central_summary.to_csv(
-                f, index=False, mode="a", header=f.tell() == 0, line_terminator="\n"
-            )
+        self.results_writer.write("central_summary", central_summary, self.run)
 
     @staticmethod
     def impact_and_units(line_item):
@@ -750,17 +821,14 @@ class Scenario:
         str, str
             Tuple of impact name and units of that impact.
         """
-        p_paren = re.compile("\(.*\)")
-        p_square = re.compile("\[.*\]")
-
-        all_paren = p_paren.findall(line_item)
-        all_square = p_square.findall(line_item)
+        # The square bracket pattern is only searched when there are no
+        # units in parentheses.
+        match = UNITS_PAREN_PATTERN.search(line_item) or UNITS_SQUARE_PATTERN.search(
+            line_item
+        )
 
-        if len(all_paren) > 0:
-            units = all_paren[0]
-            impact = line_item.replace(units, "")
-        elif len(all_square) > 0:
-            units = all_square[0]
+        if match is not None:
+            units = match.group()
             impact = line_item.replace(units, "")
         else:
             units = "unitless"
@@ -769,13 +837,7 @@ class Scenario:
         impact = " ".join(impact.split())
         impact = impact.replace(" , ", ", ")
 
-        units = (
-            units.replace("(", "")
-            .replace(")", "")
-            .replace("[", "")
-            .replace("]", "")
-            .replace("substance", "")
-        )
+        units = units.translate(UNITS_BRACKETS_TABLE).replace("substance", "")
 
         return impact, units
 
@@ -796,18 +858,9 @@ class Scenario:
             circularity metric.
         """
 
-        # Pivot the mass flows. Proper behavior results in a dataframe with a
-        # single row.
-        
-        mass["scenario"] = "scenario"  # A dummy value only used for the pivot.
-        tonnes_pivot = (
-            mass.loc[:, ["scenario", "facility_type", "tonnes"]]
-            .groupby(["scenario", "facility_type"])
-            .sum()
-            .reset_index()
-            .pivot(index=["scenario"], columns="facility_type", values="tonnes")
-            .reset_index()
-        )
+        # Total the mass flows by facility type. The metrics only sum a few
+        # of these totals, so they are kept in a plain dictionary.
+        tonnes_by_type = mass.groupby("facility_type")["tonnes"].sum().to_dict()
 
         # Get the facility types for circularity metric calculation.
         circular_pathways = self.scen.get("circular_pathways", {})
@@ -825,49 +878,34 @@ class Scenario:
         # lists so this method does not crash.
         # Place any strings into their own lists.
 
-        sc_begin = circular_pathways.get("sc_begin", [])
-        sc_end = circular_pathways.get("sc_end", [])
-        sc_in_circ = circular_pathways.get("sc_in_circ", [])
-        sc_out_circ = circular_pathways.get("sc_out_circ", [])
+        sc_begin, sc_end, sc_in_circ, sc_out_circ = (
+            _as_list(circular_pathways.get(_k, []))
+            for _k in ("sc_begin", "sc_end", "sc_in_circ", "sc_out_circ")
+        )
 
-        sc_begin = sc_begin if type(sc_begin) == list else [sc_begin]
-        sc_end = sc_end if type(sc_end) == list else [sc_end]
-        sc_in_circ = sc_in_circ if type(sc_in_circ) == list else [sc_in_circ]
-        sc_out_circ = sc_out_circ if type(sc_out_circ) == list else [sc_out_circ]
+        # Report config facility types that are missing from the mass flows
+        # once each. Missing types contribute no mass to the metrics.
 
-        # Outflow circularity
+        all_types = sc_begin + sc_end + sc_in_circ + sc_out_circ
+        for facility_type in dict.fromkeys(all_types):
+            if facility_type not in tonnes_by_type:
+                print(f'Circular pathway facility type {facility_type} in config not found in mass flows, skipping.')
 
-        outflow_numerator = 0.0
-        for facility_type in sc_out_circ:
-            if facility_type in tonnes_pivot:
-                outflow_numerator += tonnes_pivot.loc[0, facility_type]
-            else:
-                print(f'Circular pathway facility type {facility_type} in config not found in pivot, skipping.')
+        # Outflow circularity
 
-        outflow_denominator = 1.0 if len(sc_end + sc_out_circ) == 0 else 0.0
-        for facility_type in sc_out_circ + sc_end:
-            if facility_type in tonnes_pivot:
-                outflow_denominator += tonnes_pivot.loc[0, facility_type]
-            else:
-                print(f'Circular pathway facility type {facility_type} in config not found in pivot, skipping.')
+        outflow_numerator = sum(tonnes_by_type.get(t, 0.0) for t in sc_out_circ)
+        outflow_denominator = (1.0 if len(sc_end + sc_out_circ) == 0 else 0.0) + sum(
+            tonnes_by_type.get(t, 0.0) for t in sc_out_circ + sc_end
+        )
 
         outflow_circularity = outflow_numerator / outflow_denominator
 
         # Inflow circularity
 
-        inflow_numerator = 0.0
-        for facility_type in sc_in_circ:
-            if facility_type in tonnes_pivot:
-                inflow_numerator += tonnes_pivot.loc[0, facility_type]
-            else:
-                print(f'Circular pathway facility type {facility_type} in config not found in pivot, skipping.')
-
-        inflow_denominator = 1.0 if len(sc_begin + sc_in_circ) == 0 else 0.0
-        for facility_type in sc_in_circ + sc_begin:
-            if facility_type in tonnes_pivot:
-                inflow_denominator += tonnes_pivot.loc[0, facility_type]
-            else:
-                print(f'Circular pathway facility type {facility_type} in config not found in pivot, skipping.')
+        inflow_numerator = sum(tonnes_by_type.get(t, 0.0) for t in sc_in_circ)
+        inflow_denominator = (1.0 if len(sc_begin + sc_in_circ) == 0 else 0.0) + sum(
+            tonnes_by_type.get(t, 0.0) for t in sc_in_circ + sc_begin
+        )
 
         inflow_circularity = inflow_numerator / inflow_denominator
 
@@ -877,50 +915,49 @@ class Scenario:
         """Move old CSV results files to a timestamped sub-directory."""
         # If the user wants to remove old results from the results directory,
         if self.scen["flags"].get("clear_results", True):
-            # Define the new directory name uniquely using a timestamp.
-            _dir = "results-" + str(self.simtime(0.0))
-            # Create the directory.
-            os.makedirs(os.path.join(self.args.data, _dir))
-            # For all CSV results files,
-            for _n, _f in self.case["files"].get("results").items():
-                # If the file exists in the results directory,
-                if os.path.isfile(self.files[_n]):
-                    # Move it to the newly created, timestamped directory
-                    os.rename(self.files[_n], os.path.join(self.args.data, _dir, _f))
-            # For all diagnostic plots in the results directory,
-            for _f in os.listdir(
-                os.path.join(self.args.data, self.case["directories"].get("results"))
-            ):
-                if _f.endswith(".png"):
-                    os.rename(
-                        os.path.join(
-                            self.args.data, self.case["directories"].get("results"), _f
-                        ),
-                        os.path.join(self.args.data, _dir, _f),
-                    )
-            # After processing all results files, if the timestamped directory
-            # is empty, delete it (there were no results files to move)
-            if not os.listdir(os.path.join(self.args.data, _dir)):
-                os.rmdir(os.path.join(self.args.data, _dir))
+            _results_dir = os.path.join(
+                self.args.data, self.case["directories"].get("results")
+            )
+            # Names of the CSV results files defined in the case config
+            _results_files = set(self.case["files"].get("results").values())
+            # Collect the CSV results files and diagnostic plots in a single
+            # pass over the results directory.
+            with os.scandir(_results_dir) as _entries:
+                _to_move = [
+                    _entry.name
+                    for _entry in _entries
+                    if _entry.is_file()
+                    and (_entry.name in _results_files or _entry.name.endswith(".png"))
+                ]
+            # Only create the timestamped directory if there is something to
+            # move into it.
+            if _to_move:
+                # Define the new directory name uniquely using a timestamp.
+                _dir = os.path.join(self.args.data, "results-" + str(self.simtime(0.0)))
+                os.makedirs(_dir)
+                for _f in _to_move:
+                    os.replace(os.path.join(_results_dir, _f), os.path.join(_dir, _f))
 
     @staticmethod
     def simtime(starttime):
         """
-        Record the current simulation time to one decimal point.
+        Record the current simulation time to the nearest second.
 
         The simulation time does not reset for additional model runs.
 
         Parameters
         ----------
         starttime : float
-            Time that the simulation began.
+            Time that the simulation began, from time.monotonic(). If 0.0,
+            the current wall clock time is returned instead, for use as a
+            timestamp.
 
         Return
         ------
-        [float]
-            Time since simulation began.
+        [int]
+            Time since simulation began, or the current Unix time.
         """
         if starttime == 0.0:
-            return int(np.round(time.time()))
+            return int(round(time.time()))
         else:
-            return int(np.round(time.time() - starttime))
+            return int(round(time.monotonic() - starttime))
@@ -0,0 +1,89 @@
+import pickle
+import pytest
+import pandas as pd
+import numpy as np
+
+from celavi.costgraph import CostGraph
+
+
+@pytest.fixture()
+def a_costgraph(tmp_path):
+    # One manufacturing facility supplying one power plant, which sends its
+    # components to one landfill
+    pd.DataFrame(
+        {
+            "facility_id": [1, 2, 3],
+            "facility_type": ["manufacturing", "power plant", "landfill"],
+            "long": [-105.0, -104.0, -103.0],
+            "lat": [39.0, 40.0, 41.0],
+            "region_id_1": ["US", "US", "US"],
+            "region_id_2": ["CO", "CO", "CO"],
+            "region_id_3": ["Boulder", "Weld", "Logan"],
+            "region_id_4": [np.nan, np.nan, np.nan],
+        }
+    ).to_csv(tmp_path / "locations.csv", index=False)
+    pd.DataFrame(
+        {
+            "facility_type": ["manufacturing", "power plant", "landfill"],
+            "step": ["manufacturing", "in use", "landfilling"],
+            "step_cost_method": ["zero_method", "zero_method", "zero_method"],
+            "connects": ["out", "bid", "bid"],
+            "facility_id": [1, 2, 3],
+        }
+    ).to_csv(tmp_path / "step_costs.csv", index=False)
+    pd.DataFrame(
+        {
+            "facility_type": ["manufacturing", "power plant", "landfill"],
+            "step": ["manufacturing", "in use", "landfilling"],
+            "next_step": [np.nan, np.nan, np.nan],
+        }
+    ).to_csv(tmp_path / "fac_edges.csv", index=False)
+    pd.DataFrame(
+        {
+            "u_step": ["manufacturing", "in use"],
+            "v_step": ["in use", "landfilling"],
+            "transpo_cost_method": ["zero_method", "zero_method"],
+        }
+    ).to_csv(tmp_path / "transpo_edges.csv", index=False)
+    pd.DataFrame(
+        {
+            "source_facility_id": [1, 2],
+            "source_facility_type": ["manufacturing", "power plant"],
+            "destination_facility_id": [2, 3],
+            "destination_facility_type": ["power plant", "landfill"],
+            "total_vkmt": [100.0, 50.0],
+            "route_id": ["route_1", "route_2"],
+            "vkmt": [100.0, 50.0],
+            "county": ["Boulder", "Weld"],
+        }
+    ).to_csv(tmp_path / "routes.csv", index=False)
+
+    return CostGraph(
+        step_costs_file=tmp_path / "step_costs.csv",
+        fac_edges_file=tmp_path / "fac_edges.csv",
+        transpo_edges_file=tmp_path / "transpo_edges.csv",
+        locations_file=tmp_path / "locations.csv",
+        routes_file=tmp_path / "routes.csv",
+        pathway_crit_history_filename=tmp_path / "pathway_crit_history.csv",
+        circular_components=["blade"],
+        component_initial_mass=1.0,
+        path_dict={},
+    )
+
+
+def test_pickle_round_trip(a_costgraph):
+    restored = pickle.loads(pickle.dumps(a_costgraph))
+    assert restored.find_upstream_neighbor(2) == 1
+
+
+def test_unpickle_without_indices(a_costgraph):
+    # Pickles saved before the lookup indices were added do not contain them
+    for attribute in [
+        "_step_costs_by_facility",
+        "_fac_edges_by_type",
+        "_step_index",
+        "_facility_index",
+    ]:
+        delattr(a_costgraph, attribute)
+    restored = pickle.loads(pickle.dumps(a_costgraph))
+    assert restored.find_upstream_neighbor(2) == 1
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+from celavi.results_writer import ResultsWriter
+
+
+@pytest.fixture()
+def a_writer(tmp_path):
+    writer = ResultsWriter(
+        files={"lcia_transpo_results": str(tmp_path / "transpo.csv")}
+    )
+    yield writer
+    writer.close()
+
+
+@pytest.fixture()
+def some_results():
+    return pd.DataFrame({"year": [2020, 2021], "impact_value": [1.5, 2.5]})
+
+
+def test_write_results_once_per_run(a_writer, some_results):
+    for run in range(3):
+        a_writer.write("lcia_transpo_results", some_results, run)
+    a_writer.close()
+    actual = pd.read_csv(a_writer.files["lcia_transpo_results"])
+    assert len(actual) == len(some_results) * 3
+
+
+def test_write_results_twice_in_one_run(a_writer, some_results):
+    a_writer.write("lcia_transpo_results", some_results, 0)
+    with pytest.raises(ValueError):
+        a_writer.write("lcia_transpo_results", some_results, 0)
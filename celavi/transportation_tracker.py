@@ -8,6 +8,10 @@ class TransportationTracker:
     the inbound tonne_km only increments.
     """
 
+    # There is one tracker per facility, and each only holds its two
+    # history arrays, so instances do not carry a per-instance __dict__.
+    __slots__ = ("inbound_tonne_km", "route_id")
+
     def __init__(self, timesteps):
         """
         Parameters